@@ -0,0 +1,42 @@
+"""Batch vs scalar decoding of captured WP6003 frames.
+
+Run from the repository root with ``python -m benchmarks.bench_batch``.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+from custom_components.vson.vson_ble.batch import decode_frames
+from custom_components.vson.vson_ble.decoder import FrameError, decode_frame
+
+# About four weeks of 5 minute samples for 25 devices
+FRAMES = 200_000
+
+
+def main() -> None:
+    frames = [b"\x0a" + os.urandom(17) for _ in range(FRAMES)]
+    buffer = b"".join(frames)
+    decode_frames(buffer[:18])  # build the rounding tables outside the timing
+
+    start = time.perf_counter()
+    columns = decode_frames(buffer)
+    batch = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scalar = []
+    for frame in frames:
+        try:
+            scalar.append(decode_frame(frame).values)
+        except FrameError:
+            scalar.append(None)
+    single = time.perf_counter() - start
+
+    assert int(columns.valid.sum()) == sum(row is not None for row in scalar)
+    print(f"batch   {batch / FRAMES * 1e9:8.0f} ns/frame")
+    print(f"scalar  {single / FRAMES * 1e9:8.0f} ns/frame")
+
+
+if __name__ == "__main__":
+    main()
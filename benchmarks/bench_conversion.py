@@ -0,0 +1,120 @@
+"""SensorUpdate to PassiveBluetoothDataUpdate conversion cost.
+
+Compares the conversion as it was before VsonDataUpdateConverter, which
+rebuilt every key, device info and description on each update, with the
+converter for a steady stream of polls and adverts. Reports time and
+peak allocated bytes per update.
+
+Run from the repository root with ``python -m benchmarks.bench_conversion``.
+Needs Home Assistant installed.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import timeit
+import tracemalloc
+from typing import cast
+
+from homeassistant.components.bluetooth.passive_update_processor import (
+    PassiveBluetoothDataUpdate,
+    PassiveBluetoothEntityKey,
+)
+
+from custom_components.vson.device import VsonDataUpdateConverter
+from custom_components.vson.sensor import (
+    SENSOR_DESCRIPTIONS,
+    hass_device_info,
+    sensor_description,
+)
+from custom_components.vson.vson_ble import SensorUpdate, VsonBluetoothDeviceData
+
+FRAME = bytes.fromhex("0a0001010e02010908000065000f01000251")
+NUMBER = 20_000
+
+
+def legacy(sensor_update: SensorUpdate) -> PassiveBluetoothDataUpdate[float | None]:
+    """The conversion as sensor.py did it before the converter existed."""
+    return PassiveBluetoothDataUpdate(
+        devices={
+            device_id: hass_device_info(device_info)
+            for device_id, device_info in sensor_update.devices.items()
+        },
+        entity_descriptions={
+            PassiveBluetoothEntityKey(
+                device_key.key, device_key.device_id
+            ): SENSOR_DESCRIPTIONS[
+                (description.device_class, description.native_unit_of_measurement)
+            ]
+            for device_key, description in sensor_update.entity_descriptions.items()
+            if description.device_class
+        },
+        entity_data={
+            PassiveBluetoothEntityKey(device_key.key, device_key.device_id): cast(
+                float | None, sensor_values.native_value
+            )
+            for device_key, sensor_values in sensor_update.entity_values.items()
+        },
+        entity_names={
+            PassiveBluetoothEntityKey(
+                device_key.key, device_key.device_id
+            ): sensor_values.name
+            for device_key, sensor_values in sensor_update.entity_values.items()
+        },
+    )
+
+
+def sample_updates(count: int = 16) -> list[SensorUpdate]:
+    """Return updates as a device produces them, only the RSSI moving."""
+    data = VsonBluetoothDeviceData()
+    data.known_update("AA:BB:CC:DD:EE:FF")
+    updates = []
+    for index in range(count):
+        data.update_signal_strength(-60 - index % 4)
+        update = data.update_from_frame(FRAME)
+        # The device data reuses its dicts, keep a copy of this update's values
+        updates.append(
+            dataclasses.replace(
+                update,
+                entity_descriptions=dict(update.entity_descriptions),
+                entity_values=dict(update.entity_values),
+            )
+        )
+    return updates
+
+
+def measure(convert, updates: list[SensorUpdate]) -> tuple[float, float]:
+    """Return ns and peak allocated bytes per update once warmed up."""
+    for update in updates:
+        convert(update)
+
+    def run() -> None:
+        for update in updates:
+            convert(update)
+
+    number = NUMBER // len(updates)
+    best = min(timeit.repeat(run, number=number, repeat=5))
+
+    allocated = 0
+    tracemalloc.start()
+    for update in updates:
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        convert(update)
+        allocated += tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+    return best / (number * len(updates)) * 1e9, allocated / len(updates)
+
+
+def main() -> None:
+    updates = sample_updates()
+    converter = VsonDataUpdateConverter[float | None](
+        sensor_description, hass_device_info
+    )
+    for name, convert in (("legacy", legacy), ("converter", converter)):
+        ns, allocated = measure(convert, updates)
+        print(f"{name:10} {ns:8.0f} ns/update {allocated:8.0f} B/update")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Decode cost per WP6003 frame.
+
+Run from the repository root with ``python -m benchmarks.bench_decoder``.
+"""
+
+from __future__ import annotations
+
+import timeit
+
+from custom_components.vson.vson_ble.decoder import decode_frame
+
+FRAME = bytes.fromhex("0a0001010e02010908000065000f01000251")
+NUMBER = 200_000
+
+
+def legacy(data: bytes) -> tuple[float, float, float, int]:
+    """Inline shifts as used by async_poll before the decoder existed."""
+    temperature = ((data[6] << 8) + data[7]) / 10
+    tvoc = ((data[10] << 8) + data[11]) / 1000
+    hcho = ((data[12] << 8) + data[13]) / 1000
+    co2 = (data[16] << 8) + data[17]
+    return round(temperature, 2), round(tvoc, 2), round(hcho, 2), co2
+
+
+def decoder(data: bytes) -> tuple[float, float, float, int]:
+    return decode_frame(data).values
+
+
+def decoder_raw(data: bytes) -> tuple[int, int, int, int]:
+    return decode_frame(data).raw
+
+
+def main() -> None:
+    assert legacy(FRAME) == decoder(FRAME)
+    for func in (legacy, decoder, decoder_raw):
+        best = min(timeit.repeat(lambda: func(FRAME), number=NUMBER, repeat=5))
+        print(f"{func.__name__:12} {best / NUMBER * 1e9:8.0f} ns/frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Time per reading of the one-shot transaction against a simulated WP6003.
+
+The simulated device from vson_ble.simulator answers a GATT request after
+one connection interval round trip and sends the reading as a notification
+shortly after the request. The legacy path repeats what
+VsonClient.request_data did before: fixed sleeps after subscribing and
+writing, a write with response and a stop_notify before disconnecting.
+
+Run from the repository root with ``python -m benchmarks.bench_transaction``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+
+from custom_components.vson.vson_ble.const import CHAR_CMD, CHAR_NOTI
+from custom_components.vson.vson_ble.simulator import (
+    Faults,
+    SimulatedClient,
+    SimulatedWp6003,
+)
+from custom_components.vson.vson_ble.writer import VsonClient
+
+FRAME = bytes.fromhex("0a0001010e02010908000065000f01000251")
+FAULTS = Faults(
+    # One GATT request/response, e.g. a 30 ms connection interval
+    round_trip=0.030,
+    # Time the device takes to answer a reading request
+    notify_delay=0.020,
+)
+RUNS = 5
+
+
+async def legacy(client: SimulatedClient) -> bytes:
+    """The transaction as it was before, fixed sleeps included."""
+    vson = VsonClient(client)
+    await client.start_notify(CHAR_NOTI, vson._notification_handler)
+    await asyncio.sleep(0.5)
+    vson.command_data = None
+    vson.event.clear()
+    await client.write_gatt_char(CHAR_CMD, b"\xab", response=True)
+    await asyncio.sleep(0.05)
+    data = await vson.read()
+    await client.stop_notify(CHAR_NOTI)
+    return data
+
+
+async def current(client: SimulatedClient) -> bytes:
+    return await VsonClient(client).request_data()
+
+
+async def measure(transaction) -> float:
+    timings = []
+    device = SimulatedWp6003(frames=[FRAME] * RUNS, faults=FAULTS)
+    for _ in range(RUNS):
+        client = await device.connect(device.ble_device)
+        start = time.perf_counter()
+        assert await transaction(client) == FRAME
+        await client.disconnect()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+async def main() -> None:
+    for transaction in (legacy, current):
+        elapsed = await measure(transaction)
+        print(f"{transaction.__name__:8} {elapsed * 1000:6.0f} ms/reading")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+"""Cold import budget for the integration.
+
+Each measurement runs in a fresh interpreter that has already imported the
+Home Assistant modules the integration builds on, as Home Assistant itself
+would have by the time it sets the integration up. It then times
+``import custom_components.vson`` and the sensor platform and counts the
+modules they add. The script exits with status 1 when the median time or the
+module count is over budget.
+
+Run from the repository root with ``python -m benchmarks.import_budget``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+PRELOADED = (
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.components.bluetooth",
+    "homeassistant.components.bluetooth.passive_update_processor",
+    "homeassistant.components.sensor",
+    "homeassistant.helpers.update_coordinator",
+)
+TARGETS = ("custom_components.vson", "custom_components.vson.sensor")
+
+DEFAULT_MAX_MS = 60.0
+DEFAULT_MAX_MODULES = 38
+
+_PROBE = """
+import importlib, json, sys, time
+for name in {preloaded!r}:
+    importlib.import_module(name)
+before = set(sys.modules)
+start = time.perf_counter()
+for name in {targets!r}:
+    importlib.import_module(name)
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1000, "modules": sorted(set(sys.modules) - before)}}))
+"""
+
+
+def measure() -> tuple[float, list[str]]:
+    """Import the integration once in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(preloaded=PRELOADED, targets=TARGETS)],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    data = json.loads(result.stdout.splitlines()[-1])
+    return data["ms"], data["modules"]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-ms", type=float, default=DEFAULT_MAX_MS)
+    parser.add_argument("--max-modules", type=int, default=DEFAULT_MAX_MODULES)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+
+    runs = [measure() for _ in range(args.runs)]
+    elapsed = statistics.median(ms for ms, _ in runs)
+    modules = runs[-1][1]
+
+    print(f"import time: {elapsed:.1f} ms (budget {args.max_ms:.0f} ms)")
+    print(f"new modules: {len(modules)} (budget {args.max_modules})")
+    if args.verbose:
+        print("\n".join(f"  {name}" for name in modules))
+
+    if elapsed > args.max_ms or len(modules) > args.max_modules:
+        print("import budget exceeded")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""Replay a capture through the parser and the sensor conversion.
+
+Feeds every advertisement and frame of a capture file, recorded with the
+capture option, to a fresh VsonBluetoothDeviceData and converts each update
+the way the sensor platform does. By default records are replayed as fast
+as possible and the throughput is reported; ``--realtime`` keeps the
+recorded spacing, divided by ``--speed``.
+
+Run from the repository root with
+``python -m benchmarks.replay /config/vson_capture_aabbccddeeff.bin``.
+Needs Home Assistant installed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from custom_components.vson.device import VsonDataUpdateConverter
+from custom_components.vson.sensor import hass_device_info, sensor_description
+from custom_components.vson.vson_ble import VsonBluetoothDeviceData
+from custom_components.vson.vson_ble.capture import KIND_ADVERT, KIND_FRAME, iter_records
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("capture", type=Path)
+    parser.add_argument(
+        "--realtime", action="store_true", help="keep the recorded spacing"
+    )
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="speed-up factor with --realtime"
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="print every decoded reading"
+    )
+    args = parser.parse_args()
+
+    records = list(iter_records(args.capture.read_bytes()))
+    if not records:
+        parser.exit(message="No records in capture\n")
+    # Rebuild the advertisements up front so their cost is not counted
+    adverts = {
+        index: record.advert
+        for index, record in enumerate(records)
+        if record.kind == KIND_ADVERT
+    }
+    data = VsonBluetoothDeviceData()
+    convert = VsonDataUpdateConverter[float | None](
+        sensor_description, hass_device_info
+    )
+    counts = {KIND_ADVERT: 0, KIND_FRAME: 0}
+    first = records[0].timestamp
+    start = time.perf_counter()
+    for index, record in enumerate(records):
+        if args.realtime:
+            delay = (record.timestamp - first) / args.speed
+            delay -= time.perf_counter() - start
+            if delay > 0:
+                time.sleep(delay)
+        if record.kind == KIND_ADVERT:
+            update = data.update(adverts[index])
+        elif record.kind == KIND_FRAME:
+            update = data.update_from_frame(record.body, record.timestamp)
+            if args.verbose:
+                print(f"{record.timestamp:.3f} {data.last_reading}")
+        else:
+            continue
+        convert(update)
+        counts[record.kind] += 1
+    elapsed = time.perf_counter() - start
+
+    total = sum(counts.values())
+    print(
+        f"{counts[KIND_ADVERT]} adverts, {counts[KIND_FRAME]} frames"
+        f" spanning {records[-1].timestamp - first:.0f} s"
+    )
+    print(
+        f"replayed in {elapsed:.3f} s, {total / elapsed:,.0f} records/s,"
+        f" {elapsed / total * 1e6:.1f} µs/record"
+    )
+
+
+if __name__ == "__main__":
+    main()
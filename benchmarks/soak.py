@@ -0,0 +1,281 @@
+"""Fleet soak test: hundreds of simulated WP6003s in one Home Assistant.
+
+Starts Home Assistant with the bluetooth integration on a mocked adapter,
+then adds one vson config entry per simulated device and sets each up
+through the real async_setup_entry. Devices come from vson_ble.simulator,
+so every poll runs the real scheduler, coordinators and BLE transaction
+against a fake peripheral with the latencies and fault rates given. Every
+device advertises at ``--advert-interval`` with a jittering RSSI.
+
+While it runs, the harness reports:
+- event loop lag: how late a 100 ms sleep wakes up
+- resident memory
+- the number of asyncio tasks
+- poll successes and failures across the fleet
+- the scheduler queue depth
+
+Run from the repository root, e.g. for an hour with 300 devices::
+
+    python -m benchmarks.soak --devices 300 --duration 3600
+
+Needs Home Assistant and pytest-homeassistant-custom-component installed,
+the latter for its test instance of Home Assistant.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from functools import partial
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+from habluetooth import scanner
+from homeassistant.components.bluetooth import (
+    BluetoothServiceInfoBleak,
+    async_get_advertisement_callback,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.loader import DATA_CUSTOM_COMPONENTS
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+
+from custom_components.vson.const import DOMAIN, SCHEDULER
+from custom_components.vson.vson_ble import VsonBluetoothDeviceData
+from custom_components.vson.vson_ble.const import SERVICE_WP6003
+from custom_components.vson.vson_ble.simulator import Faults, SimulatedWp6003
+
+# How often the loop lag probe sleeps, in seconds
+LAG_PROBE = 0.1
+ADAPTER = {
+    "hci0": {
+        "address": "00:00:00:00:00:01",
+        "hw_version": "usb:v1D6Bp0246d053F",
+        "passive_scan": False,
+        "sw_version": "homeassistant",
+        "manufacturer": "ACME",
+        "product": "Bluetooth Adapter 5.0",
+        "product_id": "aa01",
+        "vendor_id": "cc01",
+    },
+}
+
+
+class Fleet:
+    """The simulated devices, looked up by address when connecting."""
+
+    def __init__(self, count: int, faults: Faults, seed: int) -> None:
+        self.devices = {
+            device.address: device
+            for device in (
+                SimulatedWp6003(
+                    "AA:BB:CC:" + ":".join(f"{index:06X}"[i : i + 2] for i in (0, 2, 4)),
+                    faults=faults,
+                    seed=seed + index,
+                )
+                for index in range(count)
+            )
+        }
+
+    async def connect(self, ble_device, disconnected_callback=None):
+        return await self.devices[ble_device.address].connect(
+            ble_device, disconnected_callback
+        )
+
+    def advertisement(self, device: SimulatedWp6003, rssi: int) -> BluetoothServiceInfoBleak:
+        return BluetoothServiceInfoBleak(
+            name="WP6003",
+            address=device.address,
+            rssi=rssi,
+            manufacturer_data={},
+            service_data={},
+            service_uuids=[SERVICE_WP6003],
+            source="local",
+            device=device.ble_device,
+            advertisement=None,
+            connectable=True,
+            time=time.monotonic(),
+            tx_power=None,
+        )
+
+
+def resident_memory() -> int:
+    """Return the resident set size in bytes, or the peak where unavailable."""
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+    except OSError:
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    return pages * resource.getpagesize()
+
+
+class Probe:
+    """Sample event loop lag, memory, tasks and poll outcomes."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self.lags: list[float] = []
+        self.samples: list[dict[str, Any]] = []
+
+    async def measure_lag(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(LAG_PROBE)
+            self.lags.append(loop.time() - start - LAG_PROBE)
+
+    def sample(self, elapsed: float) -> dict[str, Any]:
+        lags, self.lags = self.lags, []
+        entries = [
+            value
+            for key, value in self.hass.data.get(DOMAIN, {}).items()
+            if key != SCHEDULER
+        ]
+        successes = sum(entry["data"].metrics.successes for entry in entries)
+        failures = sum(entry["data"].metrics.failures for entry in entries)
+        scheduler = self.hass.data[DOMAIN].get(SCHEDULER)
+        sample = {
+            "elapsed": round(elapsed),
+            "lag_p50_ms": round(statistics.median(lags) * 1000, 1) if lags else None,
+            "lag_max_ms": round(max(lags) * 1000, 1) if lags else None,
+            "rss_mb": round(resident_memory() / 2**20, 1),
+            "tasks": len(asyncio.all_tasks()),
+            "successes": successes,
+            "failures": failures,
+            "success_rate": (
+                round(successes / (successes + failures), 4)
+                if successes + failures
+                else None
+            ),
+            "queue_depth": scheduler.queue_depth if scheduler else None,
+        }
+        self.samples.append(sample)
+        return sample
+
+
+async def advertise(hass: HomeAssistant, fleet: Fleet, interval: float) -> None:
+    """Send an advertisement of every device each interval, spread evenly."""
+    callback = async_get_advertisement_callback(hass)
+    rng = random.Random(0)
+    devices = list(fleet.devices.values())
+    spacing = interval / len(devices)
+    while True:
+        for device in devices:
+            callback(fleet.advertisement(device, rng.randint(-90, -50)))
+            await asyncio.sleep(spacing)
+
+
+async def soak(args: argparse.Namespace) -> list[dict[str, Any]]:
+    faults = Faults(
+        connect_latency=args.connect_latency,
+        round_trip=args.round_trip,
+        notify_delay=args.round_trip,
+        connect_failure_rate=args.connect_failure_rate,
+        drop_rate=args.drop_rate,
+    )
+    fleet = Fleet(args.devices, faults, args.seed)
+    with ExitStack() as stack:
+        config_dir = stack.enter_context(tempfile.TemporaryDirectory())
+        # The same mocks pytest-homeassistant-custom-component's
+        # enable_bluetooth fixture uses, there is no adapter to scan with
+        scanner.OriginalBleakScanner.stop = AsyncMock()
+        for target in (
+            patch("bluetooth_auto_recovery.recover_adapter"),
+            patch("bluetooth_adapters.systems.platform.system", return_value="Linux"),
+            patch("bluetooth_adapters.systems.linux.LinuxAdapters.refresh"),
+            patch("bluetooth_adapters.systems.linux.LinuxAdapters.adapters", ADAPTER),
+            patch.object(scanner.OriginalBleakScanner, "start"),
+            patch.object(scanner, "HaScanner"),
+            # Every device data connects to its simulated peripheral
+            patch(
+                "custom_components.vson.VsonBluetoothDeviceData",
+                partial(VsonBluetoothDeviceData, connect=fleet.connect),
+            ),
+        ):
+            stack.enter_context(target)
+
+        async with async_test_home_assistant(config_dir=config_dir) as hass:
+            hass.data.pop(DATA_CUSTOM_COMPONENTS, None)
+            bluetooth = MockConfigEntry(domain="bluetooth", unique_id="00:00:00:00:00:01")
+            bluetooth.add_to_hass(hass)
+            await hass.config_entries.async_setup(bluetooth.entry_id)
+
+            advertiser = hass.async_create_background_task(
+                advertise(hass, fleet, args.advert_interval), "soak advertiser"
+            )
+            # Let every device be seen once before its entry is set up
+            await asyncio.sleep(args.advert_interval)
+            entries = []
+            for address in fleet.devices:
+                entry = MockConfigEntry(
+                    domain=DOMAIN,
+                    unique_id=address,
+                    options={"persistent_connection": args.persistent},
+                )
+                entry.add_to_hass(hass)
+                await hass.config_entries.async_setup(entry.entry_id)
+                entries.append(entry)
+            await hass.async_block_till_done()
+
+            probe = Probe(hass)
+            prober = hass.async_create_background_task(probe.measure_lag(), "soak lag")
+            start = time.monotonic()
+            print(json.dumps(probe.sample(0)), flush=True)
+            while (elapsed := time.monotonic() - start) < args.duration:
+                await asyncio.sleep(min(args.report, args.duration - elapsed))
+                print(json.dumps(probe.sample(time.monotonic() - start)), flush=True)
+
+            prober.cancel()
+            advertiser.cancel()
+            for entry in entries:
+                await hass.config_entries.async_unload(entry.entry_id)
+            await hass.config_entries.async_unload(bluetooth.entry_id)
+            await hass.async_block_till_done()
+            await hass.async_stop(force=True)
+    return probe.samples
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=600, help="seconds")
+    parser.add_argument("--report", type=float, default=30, help="seconds")
+    parser.add_argument("--advert-interval", type=float, default=10, help="seconds")
+    parser.add_argument("--connect-latency", type=float, default=0.5)
+    parser.add_argument("--round-trip", type=float, default=0.03)
+    parser.add_argument("--connect-failure-rate", type=float, default=0.02)
+    parser.add_argument("--drop-rate", type=float, default=0.01)
+    parser.add_argument("--persistent", action="store_true")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="write the samples as JSON")
+    args = parser.parse_args()
+
+    samples = asyncio.run(soak(args))
+    first, last = samples[0], samples[-1]
+    lags = [sample["lag_max_ms"] for sample in samples if sample["lag_max_ms"]]
+    print(
+        f"{args.devices} devices for {last['elapsed']} s:"
+        f" worst loop lag {max(lags, default=0):.1f} ms,"
+        f" memory {first['rss_mb']} -> {last['rss_mb']} MB,"
+        f" tasks {first['tasks']} -> {last['tasks']},"
+        f" success rate {last['success_rate']}"
+    )
+    if args.output:
+        args.output.write_text(json.dumps(samples, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
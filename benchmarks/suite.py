@@ -0,0 +1,260 @@
+"""Throughput and allocations of the parser and entity pipeline hot paths.
+
+Every case runs offline on synthetic advertisements and frames:
+
+- advertisement: VsonBluetoothDeviceData.update per advertisement
+- frame: update_from_frame per frame, decoding, statistics and history
+- poll: async_poll per reading against a zero-latency simulated device
+- sensor_conversion / binary_sensor_conversion: the sensor and binary
+  sensor platforms' SensorUpdate conversion per update
+- entity_key: device_key_to_bluetooth_entity_key per key
+
+Each case reports operations per second (best of several runs) and the
+peak bytes allocated per operation. Results are compared with
+``benchmarks/baselines.json``; ``--save`` records new baselines and
+``--check`` exits with status 1 when a case is slower or allocates more
+than the tolerance allows. Baselines only mean something on the machine
+and Python they were recorded with, so record them before a change and
+compare after it.
+
+Run from the repository root with ``python -m benchmarks.suite``.
+Needs Home Assistant installed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from itertools import cycle
+from pathlib import Path
+
+from home_assistant_bluetooth import BluetoothServiceInfoBleak
+
+from benchmarks.bench_conversion import sample_updates
+from custom_components.vson.binary_sensor import binary_sensor_description
+from custom_components.vson.device import (
+    VsonDataUpdateConverter,
+    device_key_to_bluetooth_entity_key,
+)
+from custom_components.vson.sensor import hass_device_info, sensor_description
+from custom_components.vson.vson_ble import DeviceKey, VsonBluetoothDeviceData
+from custom_components.vson.vson_ble.const import SERVICE_WP6003
+from custom_components.vson.vson_ble.simulator import SimulatedWp6003, random_frames
+from homeassistant.helpers.sensor import sensor_device_info_to_hass_device_info
+
+BASELINES = Path(__file__).with_name("baselines.json")
+ADDRESS = "AA:BB:CC:DD:EE:FF"
+DEFAULT_TOLERANCE = 0.25
+REPEAT = 5
+# Aim for runs of about this long when calibrating the number of operations
+RUN_TIME = 0.2
+
+# Runs ``number`` operations of a case
+Case = Callable[[int], None]
+
+
+def advertisements(count: int = 8) -> list[BluetoothServiceInfoBleak]:
+    """Return advertisements of one device as a scanner reports them."""
+    device = SimulatedWp6003(ADDRESS).ble_device
+    return [
+        BluetoothServiceInfoBleak(
+            name="WP6003",
+            address=ADDRESS,
+            rssi=-60 - index % 4,
+            manufacturer_data={},
+            service_data={},
+            service_uuids=[SERVICE_WP6003],
+            source="local",
+            device=device,
+            advertisement=None,
+            connectable=True,
+            time=time.monotonic(),
+            tx_power=None,
+        )
+        for index in range(count)
+    ]
+
+
+def frames(count: int = 64) -> list[bytes]:
+    generator = random_frames(seed=1)
+    return [next(generator) for _ in range(count)]
+
+
+def advertisement_case() -> Case:
+    data = VsonBluetoothDeviceData()
+    infos = cycle(advertisements())
+
+    def run(number: int) -> None:
+        for _ in range(number):
+            data.update(next(infos))
+
+    return run
+
+
+def frame_case() -> Case:
+    data = VsonBluetoothDeviceData()
+    data.known_update(ADDRESS)
+    samples = cycle(frames())
+    timestamp = time.time()
+
+    def run(number: int) -> None:
+        nonlocal timestamp
+        for _ in range(number):
+            timestamp += 60
+            data.update_from_frame(next(samples), timestamp)
+
+    return run
+
+
+def poll_case() -> Case:
+    device = SimulatedWp6003(ADDRESS, seed=1)
+    data = VsonBluetoothDeviceData(connect=device.connect)
+    data.known_update(ADDRESS)
+    loop = asyncio.new_event_loop()
+
+    async def poll(number: int) -> None:
+        for _ in range(number):
+            await data.async_poll(device.ble_device)
+
+    def run(number: int) -> None:
+        loop.run_until_complete(poll(number))
+
+    return run
+
+
+def conversion_case(binary: bool) -> Callable[[], Case]:
+    def case() -> Case:
+        if binary:
+            convert = VsonDataUpdateConverter[bool | None](
+                binary_sensor_description,
+                sensor_device_info_to_hass_device_info,
+                binary=True,
+            )
+        else:
+            convert = VsonDataUpdateConverter[float | None](
+                sensor_description, hass_device_info
+            )
+        updates = cycle(sample_updates())
+
+        def run(number: int) -> None:
+            for _ in range(number):
+                convert(next(updates))
+
+        return run
+
+    return case
+
+
+def entity_key_case() -> Case:
+    keys = cycle(
+        [DeviceKey(key, None) for key in ("temperature", "co2", "tvoc", "hcho")]
+    )
+
+    def run(number: int) -> None:
+        for _ in range(number):
+            device_key_to_bluetooth_entity_key(next(keys))
+
+    return run
+
+
+CASES: dict[str, Callable[[], Case]] = {
+    "advertisement": advertisement_case,
+    "frame": frame_case,
+    "poll": poll_case,
+    "sensor_conversion": conversion_case(binary=False),
+    "binary_sensor_conversion": conversion_case(binary=True),
+    "entity_key": entity_key_case,
+}
+
+
+def measure(factory: Callable[[], Case]) -> dict[str, float]:
+    """Return operations per second and peak bytes allocated per operation."""
+    run = factory()
+    run(100)
+    number = 100
+    while (elapsed := timeit.timeit(lambda: run(number), number=1)) < RUN_TIME / 4:
+        number *= 4
+    number = max(1, int(number * RUN_TIME / elapsed))
+    best = min(timeit.repeat(lambda: run(number), number=1, repeat=REPEAT))
+
+    samples = 200
+    allocated = 0
+    tracemalloc.start()
+    for _ in range(samples):
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        run(1)
+        allocated += tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+    return {"ops": round(number / best), "bytes": round(allocated / samples)}
+
+
+def load_baselines() -> dict[str, dict[str, float]]:
+    try:
+        return json.loads(BASELINES.read_text())["cases"]
+    except FileNotFoundError:
+        return {}
+
+
+def save_baselines(results: dict[str, dict[str, float]]) -> None:
+    BASELINES.write_text(
+        json.dumps(
+            {
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "cases": results,
+            },
+            indent=2,
+        )
+        + "\n"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("cases", nargs="*", metavar="case", help=", ".join(CASES))
+    parser.add_argument("--save", action="store_true", help="record new baselines")
+    parser.add_argument(
+        "--check", action="store_true", help="exit 1 on a regression"
+    )
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+    if unknown := set(args.cases) - set(CASES):
+        parser.error(f"unknown case: {', '.join(sorted(unknown))}")
+
+    baselines = load_baselines()
+    results: dict[str, dict[str, float]] = {}
+    regressions = []
+    print(f"{'case':26} {'ops/s':>12} {'vs base':>8} {'B/op':>8} {'vs base':>8}")
+    for name in args.cases or CASES:
+        result = results[name] = measure(CASES[name])
+        line = f"{name:26} {result['ops']:12,.0f}"
+        if base := baselines.get(name):
+            speed = result["ops"] / base["ops"] - 1
+            growth = (result["bytes"] - base["bytes"]) / max(base["bytes"], 1)
+            line += f" {speed:+8.0%} {result['bytes']:8,.0f} {growth:+8.0%}"
+            if speed < -args.tolerance or growth > args.tolerance:
+                regressions.append(name)
+        else:
+            line += f" {'':8} {result['bytes']:8,.0f}"
+        print(line)
+
+    if args.save:
+        save_baselines({**baselines, **results})
+        print(f"baselines saved to {BASELINES}")
+    if regressions:
+        print(f"regressed beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+        if args.check:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,34 +4,134 @@ from __future__ import annotations
 
 from functools import partial
 import logging
-from asyncio import sleep, Lock
+import time
+from typing import TYPE_CHECKING
+import voluptuous as vol
 from .vson_ble import VsonBluetoothDeviceData, SensorUpdate
+from .vson_ble.interval import AdaptiveInterval
+
+if TYPE_CHECKING:
+    from .vson_ble.capture import CaptureLog
 from homeassistant.components.bluetooth import (
-    DOMAIN as BLUETOOTH_DOMAIN,
     BluetoothScanningMode,
     BluetoothServiceInfoBleak,
-    async_ble_device_from_address,
 )
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, CoreState
-from homeassistant.helpers import device_registry as dr
+from homeassistant.const import ATTR_DEVICE_ID, EVENT_HOMEASSISTANT_STOP, Platform
+from homeassistant.core import (
+    Event,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
 from homeassistant.helpers.device_registry import DeviceRegistry
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
 from homeassistant.util.signal_type import SignalType
-from homeassistant.exceptions import HomeAssistantError
-from datetime import timedelta
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from datetime import datetime, timedelta
+from .cache import VsonReadingCache
 from .const import (
+    CAPTURE_FLUSH_INTERVAL,
+    CONF_CACHE_MAX_AGE,
+    CONF_CAPTURE,
+    CONF_CO2_WINDOW,
     CONF_DISCOVERED_EVENT_CLASSES,
+    CONF_HCHO_WINDOW,
+    CONF_MAX_POLL_INTERVAL,
+    CONF_MIN_POLL_INTERVAL,
+    CONF_PERSISTENT_CONNECTION,
+    CONF_POLL_DEADLINE,
+    CONF_TVOC_WINDOW,
+    DEFAULT_CACHE_MAX_AGE,
+    DEFAULT_CAPTURE,
+    DEFAULT_CO2_WINDOW,
+    DEFAULT_HCHO_WINDOW,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DEFAULT_MIN_POLL_INTERVAL,
+    DEFAULT_PERSISTENT_CONNECTION,
+    DEFAULT_POLL_DEADLINE,
+    DEFAULT_TVOC_WINDOW,
     DOMAIN,
+    SCHEDULER,
     VsonBleEvent,
 )
-from .coordinator import VsonPassiveBluetoothProcessorCoordinator
+from .coordinator import VsonActiveBluetoothProcessorCoordinator
+from .history import VsonHistoryFile
+from .scheduler import MIN_POLL_DELAY, VsonPollScheduler
 from .types import VsonConfigEntry
 
-PLATFORMS: list[Platform] = [Platform.BINARY_SENSOR, Platform.EVENT, Platform.SENSOR]
+# The WP6003 only reports sensors. binary_sensor.py and event.py are kept for
+# models that do, but are not loaded until such a model is supported.
+PLATFORMS: list[Platform] = [Platform.SENSOR]
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+SERVICE_GET_HISTORY = "get_history"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_INTERVAL = "interval"
+GET_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_INTERVAL): vol.All(
+            cv.time_period, vol.Range(min=timedelta(seconds=1))
+        ),
+    }
+)
+HISTORY_FIELDS = ("temperature", "tvoc", "hcho", "co2")
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Vson Bluetooth services."""
+
+    async def _async_get_history(call: ServiceCall) -> ServiceResponse:
+        try:
+            entry_id = await get_entry_id_from_device(hass, call.data[ATTR_DEVICE_ID])
+        except ValueError as err:
+            raise ServiceValidationError(str(err)) from err
+        if entry_id not in hass.data.get(DOMAIN, {}):
+            raise ServiceValidationError(f"Device {call.data[ATTR_DEVICE_ID]} is not loaded")
+        history = hass.data[DOMAIN][entry_id]['data'].history
+        start = end = None
+        if ATTR_START in call.data:
+            # Naive times are in Home Assistant's time zone, not the OS one
+            start = dt_util.as_utc(call.data[ATTR_START]).timestamp()
+        if ATTR_END in call.data:
+            end = dt_util.as_utc(call.data[ATTR_END]).timestamp()
+        if ATTR_INTERVAL in call.data:
+            series = history.downsample(
+                call.data[ATTR_INTERVAL].total_seconds(), start, end
+            )
+        else:
+            series = history.readings(start, end)
+        return {
+            "readings": [
+                {
+                    "time": dt_util.utc_from_timestamp(timestamp).isoformat(),
+                    **dict(zip(HISTORY_FIELDS, values)),
+                }
+                for timestamp, values in series
+            ]
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        _async_get_history,
+        schema=GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    return True
+
+
 def process_service_info(
     hass: HomeAssistant,
     entry: VsonConfigEntry,
@@ -62,59 +162,190 @@ async def async_setup_entry(hass: HomeAssistant, entry: VsonConfigEntry) -> bool
     """Set up Vson Bluetooth from a config entry."""
     if DOMAIN not in hass.data:
         hass.data[DOMAIN] = {}
+    if SCHEDULER not in hass.data[DOMAIN]:
+        hass.data[DOMAIN][SCHEDULER] = VsonPollScheduler(hass)
+    scheduler: VsonPollScheduler = hass.data[DOMAIN][SCHEDULER]
     address = entry.unique_id
     assert address is not None
 
-    data = VsonBluetoothDeviceData()
+    history_file = VsonHistoryFile(hass, entry.entry_id)
+    data = VsonBluetoothDeviceData(
+        persistent=entry.options.get(
+            CONF_PERSISTENT_CONNECTION, DEFAULT_PERSISTENT_CONNECTION
+        ),
+        windows={
+            "co2": entry.options.get(CONF_CO2_WINDOW, DEFAULT_CO2_WINDOW) * 60,
+            "tvoc": entry.options.get(CONF_TVOC_WINDOW, DEFAULT_TVOC_WINDOW) * 60,
+            "hcho": entry.options.get(CONF_HCHO_WINDOW, DEFAULT_HCHO_WINDOW) * 60,
+        },
+        history=await history_file.async_load(),
+        deadline=entry.options.get(CONF_POLL_DEADLINE, DEFAULT_POLL_DEADLINE),
+    )
     hass.data[DOMAIN][entry.entry_id] = {}
     hass.data[DOMAIN][entry.entry_id]['address'] = address
     hass.data[DOMAIN][entry.entry_id]['data'] = data
+    hass.data[DOMAIN][entry.entry_id]['history_file'] = history_file
+    if entry.options.get(CONF_CAPTURE, DEFAULT_CAPTURE):
+        # Capturing is opt-in, only load it when it is on
+        from .vson_ble.capture import CaptureLog
+
+        data.capture = CaptureLog(
+            hass.config.path(f"{DOMAIN}_capture_{address.replace(':', '').lower()}.bin")
+        )
+        _LOGGER.info("%s: capturing to %s", address, data.capture.path)
+
+    interval = AdaptiveInterval(
+        floor=entry.options.get(CONF_MIN_POLL_INTERVAL, DEFAULT_MIN_POLL_INTERVAL) * 60,
+        ceiling=entry.options.get(CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL) * 60,
+    )
+
+    cache = VsonReadingCache(hass, entry.entry_id)
+    cached = await cache.async_load()
 
     device_registry = dr.async_get(hass)
     event_classes = set(entry.data.get(CONF_DISCOVERED_EVENT_CLASSES, ()))
-    bt_coordinator = VsonPassiveBluetoothProcessorCoordinator(
+    @callback
+    def _needs_poll(
+        service_info: BluetoothServiceInfoBleak, seconds_since_last_poll: float | None
+    ) -> bool:
+        # Catches up on an overdue poll as soon as the device is back in
+        # range; the scheduler starts polls that are due on time
+        return (
+            service_info.connectable
+            and not hass.is_stopping
+            and scheduler.async_poll_due(address)
+            and data.breaker.allow()
+        )
+
+    async def _async_poll(service_info: BluetoothServiceInfoBleak) -> SensorUpdate:
+        requested = time.monotonic()
+        try:
+            session = data.session
+            async with scheduler.async_poll(
+                address,
+                service_info.source,
+                None if session is None else lambda: session.is_connected,
+            ) as keep:
+                data.metrics.observe("slot", time.monotonic() - requested)
+                try:
+                    update = await data.async_poll(service_info.device)
+                finally:
+                    if session is not None and not keep:
+                        # Every slot that may stay taken is, connect per poll
+                        await session.close()
+                if data.last_reading:
+                    scheduler.async_set_interval(
+                        address,
+                        timedelta(seconds=interval.update(data.last_reading)),
+                    )
+        except Exception:
+            # An open breaker keeps the device out of the connection slots
+            # until it is time to probe it again
+            if retry_in := data.breaker.retry_in():
+                scheduler.async_postpone(address, retry_in)
+            bt_coordinator.async_push(data.metrics_update())
+            raise
+        if data.last_frame and data.last_frame_time:
+            cache.async_save(
+                data.last_frame,
+                data.last_frame_time,
+                {"title": data.title, "name": data.get_device_name()},
+            )
+        return update
+
+    bt_coordinator = VsonActiveBluetoothProcessorCoordinator(
         hass,
         _LOGGER,
         address=address,
         mode=BluetoothScanningMode.PASSIVE,
         update_method=partial(process_service_info, hass, entry, device_registry),
+        needs_poll_method=_needs_poll,
+        poll_method=_async_poll,
         device_data=data,
         discovered_event_classes=event_classes,
         connectable=True,
         entry=entry,
     )
 
-    async def _async_poll_data(hass: HomeAssistant, entry: VsonConfigEntry) -> SensorUpdate:
-        try:
-            device = async_ble_device_from_address(hass, hass.data[DOMAIN][entry.entry_id]['address'])
-            if not device:
-                raise UpdateFailed("BLE Device none")
-            coordinator = entry.runtime_data
-            return await coordinator.device_data.async_poll(device)
-        except Exception as err:
-            raise UpdateFailed(f"polling error: {err}") from err
-
-    poll_coordinator = DataUpdateCoordinator[SensorUpdate](
-        hass,
-        _LOGGER,
-        name=DOMAIN,
-        update_method=partial(_async_poll_data, hass, entry),
-        update_interval=timedelta(minutes=5),
-    )
-    
     entry.runtime_data = bt_coordinator
-    entry.runtime_data.poll_coordinator = poll_coordinator
-    await poll_coordinator.async_config_entry_first_refresh()
+    # The first poll is left to the scheduler so setup never waits on a
+    # connection; entities come from restored or known descriptions.
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    bt_coordinator.async_seed(data.known_update(address))
+
+    first_delay = MIN_POLL_DELAY
+    if cached is not None:
+        if title := cached.device.get("title"):
+            data.set_title(title)
+        if name := cached.device.get("name"):
+            data.set_device_name(name)
+        bt_coordinator.async_push(data.update_from_frame(cached.frame, cached.timestamp))
+        max_age = entry.options.get(CONF_CACHE_MAX_AGE, DEFAULT_CACHE_MAX_AGE) * 60
+        if cached.age < max_age:
+            _LOGGER.debug("%s: cached reading is %.0fs old, postponing first poll", address, cached.age)
+            first_delay = max_age - cached.age
 
     # only start after all platforms have had a chance to subscribe
     entry.async_on_unload(bt_coordinator.async_start())
+    entry.async_on_unload(
+        scheduler.async_add_device(
+            address,
+            timedelta(seconds=interval.interval),
+            bt_coordinator.async_poll_if_present,
+            first_delay,
+        )
+    )
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+
+    async def _async_save_history(event: Event) -> None:
+        await history_file.async_save(data.history)
+        await async_flush_capture(hass, data.capture)
+
+    async def _async_flush_capture(now: datetime) -> None:
+        await async_flush_capture(hass, data.capture)
+
+    if data.capture is not None:
+        entry.async_on_unload(
+            async_track_time_interval(
+                hass,
+                _async_flush_capture,
+                timedelta(seconds=CAPTURE_FLUSH_INTERVAL),
+            )
+        )
+
+    entry.async_on_unload(
+        hass.bus.async_listen(EVENT_HOMEASSISTANT_STOP, _async_save_history)
+    )
     return True
 
 
+async def async_flush_capture(hass: HomeAssistant, capture: CaptureLog | None) -> None:
+    """Append the records captured since the last flush to the capture file."""
+    if capture is not None:
+        await hass.async_add_executor_job(capture.write, capture.take())
+
+
+async def async_update_options(hass: HomeAssistant, entry: VsonConfigEntry) -> None:
+    """Reload the config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: VsonConfigEntry) -> bool:
     """Unload a config entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        device_data = entry.runtime_data.device_data
+        await device_data.async_close()
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id, None)
+        if entry_data is not None:
+            await entry_data['history_file'].async_save(device_data.history)
+        await async_flush_capture(hass, device_data.capture)
+    return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: VsonConfigEntry) -> None:
+    """Remove the cached reading and history of a deleted config entry."""
+    await VsonReadingCache(hass, entry.entry_id).async_remove()
+    await VsonHistoryFile(hass, entry.entry_id).async_remove()
 
 async def get_entry_id_from_device(hass, device_id: str) -> str:
     device_reg = dr.async_get(hass)
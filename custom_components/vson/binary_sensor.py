@@ -2,10 +2,7 @@
 
 from __future__ import annotations
 
-from .vson_ble import (
-    BinarySensorDeviceClass as VsonBinarySensorDeviceClass,
-    SensorUpdate,
-)
+from .vson_ble import BinarySensorDeviceClass as VsonBinarySensorDeviceClass
 
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
@@ -13,7 +10,6 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntityDescription,
 )
 from homeassistant.components.bluetooth.passive_update_processor import (
-    PassiveBluetoothDataUpdate,
     PassiveBluetoothProcessorEntity,
 )
 from homeassistant.core import HomeAssistant
@@ -21,7 +17,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.sensor import sensor_device_info_to_hass_device_info
 
 from .coordinator import VsonPassiveBluetoothDataProcessor
-from .device import device_key_to_bluetooth_entity_key
+from .device import VsonDataUpdateConverter
 from .types import VsonConfigEntry
 
 BINARY_SENSOR_DESCRIPTIONS = {
@@ -139,31 +135,9 @@ BINARY_SENSOR_DESCRIPTIONS = {
 }
 
 
-def sensor_update_to_bluetooth_data_update(
-    sensor_update: SensorUpdate,
-) -> PassiveBluetoothDataUpdate[bool | None]:
-    """Convert a binary sensor update to a bluetooth data update."""
-    return PassiveBluetoothDataUpdate(
-        devices={
-            device_id: sensor_device_info_to_hass_device_info(device_info)
-            for device_id, device_info in sensor_update.devices.items()
-        },
-        entity_descriptions={
-            device_key_to_bluetooth_entity_key(device_key): BINARY_SENSOR_DESCRIPTIONS[
-                description.device_class
-            ]
-            for device_key, description in sensor_update.binary_entity_descriptions.items()
-            if description.device_class
-        },
-        entity_data={
-            device_key_to_bluetooth_entity_key(device_key): sensor_values.native_value
-            for device_key, sensor_values in sensor_update.binary_entity_values.items()
-        },
-        entity_names={
-            device_key_to_bluetooth_entity_key(device_key): sensor_values.name
-            for device_key, sensor_values in sensor_update.binary_entity_values.items()
-        },
-    )
+def binary_sensor_description(description) -> BinarySensorEntityDescription | None:
+    """Return the entity description for a binary sensor description."""
+    return BINARY_SENSOR_DESCRIPTIONS.get(description.device_class)
 
 
 async def async_setup_entry(
@@ -174,7 +148,11 @@ async def async_setup_entry(
     """Set up the Vson BLE binary sensors."""
     coordinator = entry.runtime_data
     processor = VsonPassiveBluetoothDataProcessor(
-        sensor_update_to_bluetooth_data_update
+        VsonDataUpdateConverter[bool | None](
+            binary_sensor_description,
+            sensor_device_info_to_hass_device_info,
+            binary=True,
+        )
     )
     entry.async_on_unload(
         processor.async_add_entities_listener(
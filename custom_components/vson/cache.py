@@ -0,0 +1,75 @@
+"""Last reading cache for Vson Bluetooth devices."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import time
+from typing import Any, TypedDict
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+# Coalesce writes; a reading is at most this many seconds from being saved
+SAVE_DELAY = 30
+
+
+class StoredReading(TypedDict):
+    """Stored form of the last reading."""
+
+    frame: str
+    timestamp: float
+    device: dict[str, str | None]
+
+
+@dataclass(slots=True)
+class CachedReading:
+    """A previously received frame and when it was received."""
+
+    frame: bytes
+    timestamp: float
+    device: dict[str, str | None]
+
+    @property
+    def age(self) -> float:
+        """Return the age in seconds."""
+        return time.time() - self.timestamp
+
+
+class VsonReadingCache:
+    """Keep the last decoded frame of a config entry across restarts."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the cache."""
+        self._store: Store[StoredReading] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.last_reading"
+        )
+        self._data: StoredReading | None = None
+
+    async def async_load(self) -> CachedReading | None:
+        """Return the cached reading, if any."""
+        if not (data := await self._store.async_load()):
+            return None
+        try:
+            return CachedReading(
+                bytes.fromhex(data["frame"]), data["timestamp"], data["device"]
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def async_save(
+        self, frame: bytes, timestamp: float, device: dict[str, Any]
+    ) -> None:
+        """Schedule a save of the latest reading."""
+        self._data = {"frame": frame.hex(), "timestamp": timestamp, "device": device}
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _data_to_save(self) -> StoredReading:
+        assert self._data is not None
+        return self._data
+
+    async def async_remove(self) -> None:
+        """Remove the cache file."""
+        await self._store.async_remove()
@@ -14,10 +14,37 @@ from homeassistant.components.bluetooth import (
     BluetoothServiceInfoBleak,
     async_discovered_service_info,
 )
-from homeassistant.config_entries import SOURCE_REAUTH, ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    SOURCE_REAUTH,
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
 from homeassistant.const import CONF_ADDRESS
-
-from .const import DOMAIN
+from homeassistant.core import callback
+
+from .const import (
+    CONF_CACHE_MAX_AGE,
+    CONF_CAPTURE,
+    CONF_CO2_WINDOW,
+    CONF_HCHO_WINDOW,
+    CONF_MAX_POLL_INTERVAL,
+    CONF_MIN_POLL_INTERVAL,
+    CONF_PERSISTENT_CONNECTION,
+    CONF_POLL_DEADLINE,
+    CONF_TVOC_WINDOW,
+    DEFAULT_CACHE_MAX_AGE,
+    DEFAULT_CAPTURE,
+    DEFAULT_CO2_WINDOW,
+    DEFAULT_HCHO_WINDOW,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DEFAULT_MIN_POLL_INTERVAL,
+    DEFAULT_PERSISTENT_CONNECTION,
+    DEFAULT_POLL_DEADLINE,
+    DEFAULT_TVOC_WINDOW,
+    DOMAIN,
+)
 
 
 @dataclasses.dataclass
@@ -38,6 +65,12 @@ class VsonConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> VsonOptionsFlow:
+        """Get the options flow for this handler."""
+        return VsonOptionsFlow()
+
     def __init__(self) -> None:
         """Initialize the config flow."""
         self._discovery_info: BluetoothServiceInfoBleak | None = None
@@ -145,3 +178,73 @@ class VsonConfigFlow(ConfigFlow, domain=DOMAIN):
             title=self.context["title_placeholders"]["name"],
             data=data,
         )
+
+
+class VsonOptionsFlow(OptionsFlow):
+    """Handle Vson Bluetooth options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            if user_input.get(
+                CONF_MIN_POLL_INTERVAL, DEFAULT_MIN_POLL_INTERVAL
+            ) > user_input.get(CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL):
+                errors["base"] = "min_above_max"
+            else:
+                return self.async_create_entry(data=user_input)
+
+        # Show what was entered again when it was rejected
+        options = {**self.config_entry.options, **(user_input or {})}
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_PERSISTENT_CONNECTION,
+                        default=options.get(
+                            CONF_PERSISTENT_CONNECTION, DEFAULT_PERSISTENT_CONNECTION
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_MIN_POLL_INTERVAL,
+                        default=options.get(
+                            CONF_MIN_POLL_INTERVAL, DEFAULT_MIN_POLL_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1440)),
+                    vol.Optional(
+                        CONF_MAX_POLL_INTERVAL,
+                        default=options.get(
+                            CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1440)),
+                    vol.Optional(
+                        CONF_CACHE_MAX_AGE,
+                        default=options.get(CONF_CACHE_MAX_AGE, DEFAULT_CACHE_MAX_AGE),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1440)),
+                    vol.Optional(
+                        CONF_CO2_WINDOW,
+                        default=options.get(CONF_CO2_WINDOW, DEFAULT_CO2_WINDOW),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1440)),
+                    vol.Optional(
+                        CONF_TVOC_WINDOW,
+                        default=options.get(CONF_TVOC_WINDOW, DEFAULT_TVOC_WINDOW),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1440)),
+                    vol.Optional(
+                        CONF_HCHO_WINDOW,
+                        default=options.get(CONF_HCHO_WINDOW, DEFAULT_HCHO_WINDOW),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1440)),
+                    vol.Optional(
+                        CONF_POLL_DEADLINE,
+                        default=options.get(CONF_POLL_DEADLINE, DEFAULT_POLL_DEADLINE),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=5, max=300)),
+                    vol.Optional(
+                        CONF_CAPTURE,
+                        default=options.get(CONF_CAPTURE, DEFAULT_CAPTURE),
+                    ): bool,
+                }
+            ),
+            errors=errors,
+        )
@@ -6,9 +6,37 @@ from typing import Final, TypedDict
 
 DOMAIN = "vson"
 LOCK = "lock"
+SCHEDULER = "scheduler"
 CONF_BINDKEY: Final = "bindkey"
 CONF_DISCOVERED_EVENT_CLASSES: Final = "known_events"
 CONF_SUBTYPE: Final = "subtype"
+CONF_PERSISTENT_CONNECTION: Final = "persistent_connection"
+CONF_MIN_POLL_INTERVAL: Final = "min_poll_interval"
+CONF_MAX_POLL_INTERVAL: Final = "max_poll_interval"
+CONF_CACHE_MAX_AGE: Final = "cache_max_age"
+CONF_CO2_WINDOW: Final = "co2_window"
+CONF_TVOC_WINDOW: Final = "tvoc_window"
+CONF_HCHO_WINDOW: Final = "hcho_window"
+CONF_CAPTURE: Final = "capture"
+CONF_POLL_DEADLINE: Final = "poll_deadline"
+
+DEFAULT_PERSISTENT_CONNECTION: Final = False
+# Adaptive poll interval limits, in minutes
+DEFAULT_MIN_POLL_INTERVAL: Final = 1
+DEFAULT_MAX_POLL_INTERVAL: Final = 15
+# A cached reading younger than this (minutes) postpones the first poll
+DEFAULT_CACHE_MAX_AGE: Final = 10
+# Rolling statistics windows in minutes, 0 turns them off
+DEFAULT_CO2_WINDOW: Final = 60
+DEFAULT_TVOC_WINDOW: Final = 0
+DEFAULT_HCHO_WINDOW: Final = 480
+DEFAULT_CAPTURE: Final = False
+# Seconds one poll may take from connecting to the reading
+DEFAULT_POLL_DEADLINE: Final = 30
+# Seconds between writes of captured records to disk
+CAPTURE_FLUSH_INTERVAL: Final = 30
+# Concurrent connections allowed through a single adapter or proxy
+DEFAULT_MAX_CONNECTIONS_PER_ADAPTER: Final = 2
 
 EVENT_TYPE: Final = "event_type"
 EVENT_CLASS: Final = "event_class"
@@ -1,28 +1,40 @@
 """The Vson Bluetooth integration."""
 
+import asyncio
 from collections.abc import Callable, Coroutine
 from logging import Logger
 from typing import Any
 
+from bleak import BleakError
+
 from .vson_ble import VsonBluetoothDeviceData, SensorUpdate
 
 from homeassistant.components.bluetooth import (
     BluetoothScanningMode,
     BluetoothServiceInfoBleak,
+    async_last_service_info,
+)
+from homeassistant.components.bluetooth.active_update_processor import (
+    ActiveBluetoothProcessorCoordinator,
 )
 from homeassistant.components.bluetooth.passive_update_processor import (
     PassiveBluetoothDataProcessor,
-    PassiveBluetoothProcessorCoordinator,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 
 from .types import VsonConfigEntry
 
 
-class VsonPassiveBluetoothProcessorCoordinator(
-    PassiveBluetoothProcessorCoordinator[SensorUpdate]
+class VsonActiveBluetoothProcessorCoordinator(
+    ActiveBluetoothProcessorCoordinator[SensorUpdate]
 ):
-    """Define a Vson Bluetooth Passive Update Processor Coordinator."""
+    """Define a Vson Bluetooth Active Update Processor Coordinator.
+
+    Advertisements and polls feed the same processors. A poll only starts
+    while the device is being heard, so one that is out of range is never
+    connected to. Polls run one at a time, whether the scheduler or an
+    advertisement started them.
+    """
 
     def __init__(
         self,
@@ -31,21 +43,96 @@ class VsonPassiveBluetoothProcessorCoordinator(
         address: str,
         mode: BluetoothScanningMode,
         update_method: Callable[[BluetoothServiceInfoBleak], SensorUpdate],
+        needs_poll_method: Callable[[BluetoothServiceInfoBleak, float | None], bool],
+        poll_method: Callable[
+            [BluetoothServiceInfoBleak], Coroutine[Any, Any, SensorUpdate]
+        ],
         device_data: VsonBluetoothDeviceData,
         discovered_event_classes: set[str],
         entry: VsonConfigEntry,
         connectable: bool = True,
     ) -> None:
-        """Initialize the Vson Bluetooth Passive Update Processor Coordinator."""
-        super().__init__(hass, logger, address, mode, update_method, connectable)
+        """Initialize the Vson Bluetooth Active Update Processor Coordinator."""
+        self.poll_method = poll_method
+        self._poll_lock = asyncio.Lock()
+        super().__init__(
+            hass,
+            logger,
+            address=address,
+            mode=mode,
+            update_method=update_method,
+            needs_poll_method=needs_poll_method,
+            poll_method=self._async_poll_advertised,
+            connectable=connectable,
+        )
         self.discovered_event_classes = discovered_event_classes
         self.device_data = device_data
         self.entry = entry
 
+    async def async_poll_if_present(self) -> None:
+        """Poll if the device was heard recently and a poll is due.
+
+        Bluetooth does not dispatch an advertisement that repeats the last
+        one, and a WP6003 always sends the same, so the scheduler calls this
+        rather than waiting for one.
+        """
+        service_info = async_last_service_info(
+            self.hass, self.address, connectable=True
+        )
+        if service_info is None:
+            self.logger.debug("%s: not heard recently, skipping poll", self.address)
+            return
+        if self._poll_lock.locked():
+            return
+        async with self._poll_lock:
+            if not self.needs_poll(service_info):
+                return
+            try:
+                update = await self.poll_method(service_info)
+            except BleakError as err:
+                if self.last_poll_successful:
+                    self.logger.error(
+                        "%s: Bluetooth error whilst polling: %s", self.address, err
+                    )
+                    self.last_poll_successful = False
+                return
+            except Exception:
+                if self.last_poll_successful:
+                    self.logger.exception("%s: Failure while polling", self.address)
+                    self.last_poll_successful = False
+                return
+        if not self.last_poll_successful:
+            self.logger.debug("%s: Polling recovered", self.address)
+            self.last_poll_successful = True
+        self.async_push(update)
+
+    async def _async_poll_advertised(
+        self, service_info: BluetoothServiceInfoBleak
+    ) -> SensorUpdate:
+        """Run a poll an advertisement found due, unless one ran meanwhile."""
+        async with self._poll_lock:
+            if not self.needs_poll(service_info):
+                # A scheduled poll got there first and published its reading
+                return self.device_data.metrics_update()
+            return await self.poll_method(service_info)
+
+    @callback
+    def async_push(self, update: SensorUpdate) -> None:
+        """Pass an update that did not come from an advertisement to all processors."""
+        for processor in self._processors:
+            processor.async_handle_update(update)
+
+    @callback
+    def async_seed(self, update: SensorUpdate) -> None:
+        """Create entities for processors that have nothing restored yet."""
+        for processor in self._processors:
+            if not processor.entity_descriptions:
+                processor.async_handle_update(update)
+
 
 class VsonPassiveBluetoothDataProcessor[_T](
     PassiveBluetoothDataProcessor[_T, SensorUpdate]
 ):
     """Define a Vson Bluetooth Passive Update Data Processor."""
 
-    coordinator: VsonPassiveBluetoothProcessorCoordinator
+    coordinator: VsonActiveBluetoothProcessorCoordinator
@@ -2,15 +2,101 @@
 
 from __future__ import annotations
 
-from .vson_ble import DeviceKey
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Any
+
+from .vson_ble import DeviceKey, SensorDeviceInfo, SensorUpdate
 
 from homeassistant.components.bluetooth.passive_update_processor import (
+    PassiveBluetoothDataUpdate,
     PassiveBluetoothEntityKey,
 )
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity import EntityDescription
 
 
+@lru_cache(maxsize=1024)
 def device_key_to_bluetooth_entity_key(
     device_key: DeviceKey,
 ) -> PassiveBluetoothEntityKey:
     """Convert a device key to an entity key."""
     return PassiveBluetoothEntityKey(device_key.key, device_key.device_id)
+
+
+class VsonDataUpdateConverter[_T]:
+    """Convert the SensorUpdates of one processor into data updates.
+
+    Device info and entity descriptions are converted once and only re-sent
+    when they change. Values and names are only sent when they differ from
+    what this converter sent before; the processor merges each update into
+    the data it already holds, so the result is the same as sending it all.
+    """
+
+    def __init__(
+        self,
+        describe: Callable[[Any], EntityDescription | None],
+        to_device_info: Callable[[SensorDeviceInfo], DeviceInfo],
+        binary: bool = False,
+    ) -> None:
+        """Initialize the converter."""
+        self._describe = describe
+        self._to_device_info = to_device_info
+        self._binary = binary
+        self._devices: dict[str | None, tuple[Any, ...]] = {}
+        self._descriptions: dict[DeviceKey, Any] = {}
+        self._values: dict[DeviceKey, tuple[str | None, Any]] = {}
+
+    def __call__(self, sensor_update: SensorUpdate) -> PassiveBluetoothDataUpdate[_T]:
+        """Convert a sensor update to a bluetooth data update."""
+        devices: dict[str | None, DeviceInfo] = {}
+        for device_id, device_info in sensor_update.devices.items():
+            # SensorDeviceInfo is updated in place, so compare its fields
+            fields = (
+                device_info.name,
+                device_info.model,
+                device_info.manufacturer,
+                device_info.sw_version,
+                device_info.hw_version,
+            )
+            if self._devices.get(device_id) != fields:
+                self._devices[device_id] = fields
+                devices[device_id] = self._to_device_info(device_info)
+
+        if self._binary:
+            descriptions = sensor_update.binary_entity_descriptions
+            values = sensor_update.binary_entity_values
+        else:
+            descriptions = sensor_update.entity_descriptions
+            values = sensor_update.entity_values
+
+        entity_descriptions: dict[PassiveBluetoothEntityKey, EntityDescription] = {}
+        for device_key, description in descriptions.items():
+            # Descriptions are rebuilt on every update, compare them by value
+            if self._descriptions.get(device_key) == description:
+                continue
+            self._descriptions[device_key] = description
+            if description.device_class and (
+                entity_description := self._describe(description)
+            ):
+                entity_descriptions[
+                    device_key_to_bluetooth_entity_key(device_key)
+                ] = entity_description
+
+        entity_data: dict[PassiveBluetoothEntityKey, _T] = {}
+        entity_names: dict[PassiveBluetoothEntityKey, str | None] = {}
+        for device_key, sensor_value in values.items():
+            current = (sensor_value.name, sensor_value.native_value)
+            if self._values.get(device_key) == current:
+                continue
+            self._values[device_key] = current
+            entity_key = device_key_to_bluetooth_entity_key(device_key)
+            entity_data[entity_key] = sensor_value.native_value
+            entity_names[entity_key] = sensor_value.name
+
+        return PassiveBluetoothDataUpdate(
+            devices=devices,
+            entity_descriptions=entity_descriptions,
+            entity_data=entity_data,
+            entity_names=entity_names,
+        )
@@ -0,0 +1,30 @@
+"""Diagnostics support for Vson Bluetooth."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, SCHEDULER
+from .types import VsonConfigEntry
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: VsonConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = entry.runtime_data
+    data = coordinator.device_data
+    return {
+        "options": dict(entry.options),
+        "available": coordinator.available,
+        "last_poll_success": coordinator.last_poll_successful,
+        "persistent_connection": data.session is not None,
+        "last_reading": data.last_reading,
+        "last_frame_time": data.last_frame_time,
+        "history": {"samples": len(data.history), "bytes": data.history.size},
+        "metrics": data.metrics.as_dict(),
+        "breaker": data.breaker.as_dict(),
+        "scheduler": hass.data[DOMAIN][SCHEDULER].stats(),
+    }
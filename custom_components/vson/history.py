@@ -0,0 +1,57 @@
+"""Reading history file for Vson Bluetooth devices."""
+
+from __future__ import annotations
+
+import logging
+import os
+from pathlib import Path
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import STORAGE_DIR
+
+from .const import DOMAIN
+from .vson_ble.history import HistoryStore
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _read(path: Path) -> bytes | None:
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def _write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_suffix(".tmp")
+    temp.write_bytes(data)
+    os.replace(temp, path)
+
+
+class VsonHistoryFile:
+    """Keep the compressed history of a config entry in a binary file."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the history file."""
+        self.hass = hass
+        self.path = Path(hass.config.path(STORAGE_DIR, f"{DOMAIN}.{entry_id}.history"))
+
+    async def async_load(self) -> HistoryStore:
+        """Return the saved history, or an empty one."""
+        data = await self.hass.async_add_executor_job(_read, self.path)
+        if data is None:
+            return HistoryStore()
+        try:
+            return HistoryStore.from_bytes(data)
+        except ValueError as err:
+            _LOGGER.warning("Discarding unreadable history %s: %s", self.path, err)
+            return HistoryStore()
+
+    async def async_save(self, history: HistoryStore) -> None:
+        """Write the history."""
+        await self.hass.async_add_executor_job(_write, self.path, history.to_bytes())
+
+    async def async_remove(self) -> None:
+        """Remove the history file."""
+        await self.hass.async_add_executor_job(self.path.unlink, True)
@@ -0,0 +1,291 @@
+"""Integration-wide poll scheduler for Vson Bluetooth devices."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Callable, Coroutine
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+import logging
+import time
+from typing import Any
+from zlib import crc32
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DEFAULT_MAX_CONNECTIONS_PER_ADAPTER
+
+_LOGGER = logging.getLogger(__name__)
+
+# Never schedule a poll closer than this to the previous one
+MIN_POLL_DELAY = 1.0
+
+
+def stagger_offset(address: str, period: float) -> float:
+    """Return a stable offset in [0, period) derived from the address."""
+    return crc32(address.encode()) / 0x100000000 * period
+
+
+class _ScheduledPoll:
+    """Periodic poll of a single device.
+
+    The first poll is phase shifted by the address across one interval, so
+    devices set up together are spread over the whole period; every later
+    one follows the previous by the current interval, so a changed interval
+    is the real gap between two readings.
+    """
+
+    def __init__(
+        self,
+        scheduler: VsonPollScheduler,
+        address: str,
+        interval: timedelta,
+        action: Callable[[], Coroutine[Any, Any, Any]],
+    ) -> None:
+        self.scheduler = scheduler
+        self.address = address
+        self.interval = interval
+        self.action = action
+        self._cancel: CALLBACK_TYPE | None = None
+        self._task: asyncio.Task | None = None
+        # Monotonic time from which the next poll is due
+        self.due = 0.0
+        self.running = False
+
+    def next_delay(self) -> float:
+        return max(self.interval.total_seconds(), MIN_POLL_DELAY)
+
+    @property
+    def is_due(self) -> bool:
+        return not self.running and time.monotonic() >= self.due
+
+    @callback
+    def schedule(self, delay: float | None = None) -> None:
+        """Set when the next poll is due and start a timer for it."""
+        delay = self.next_delay() if delay is None else delay
+        self.due = time.monotonic() + delay
+        self.start_timer(delay)
+
+    @callback
+    def start_timer(self, delay: float) -> None:
+        self.cancel_timer()
+        self._cancel = async_call_later(self.scheduler.hass, delay, self._fire)
+
+    @callback
+    def cancel_timer(self) -> None:
+        if self._cancel is not None:
+            self._cancel()
+            self._cancel = None
+
+    @callback
+    def cancel(self) -> None:
+        self.cancel_timer()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    @callback
+    def _fire(self, _now: datetime) -> None:
+        self._cancel = None
+        self._task = self.scheduler.hass.async_create_background_task(
+            self._run(), f"vson poll {self.address}"
+        )
+
+    async def _run(self) -> None:
+        try:
+            await self.action()
+        except Exception:
+            _LOGGER.exception("Unexpected error polling %s", self.address)
+        finally:
+            self._task = None
+            if not self.running and self._cancel is None:
+                now = time.monotonic()
+                # No poll ran, e.g. the device was not around: check again
+                # next period and let an advertisement start it sooner. A
+                # timer that fired early waits for the rest.
+                self.start_timer(
+                    self.next_delay()
+                    if now >= self.due
+                    else max(self.due - now, MIN_POLL_DELAY)
+                )
+
+
+class VsonPollScheduler:
+    """Spread polls over time and cap concurrent connections per adapter."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS_PER_ADAPTER,
+    ) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.max_connections = max_connections
+        self._slots: dict[str, asyncio.Semaphore] = {}
+        self._waiting: dict[str, int] = {}
+        self._polls: dict[str, _ScheduledPoll] = {}
+        # Source each device keeps an open connection and its slot through
+        self._kept: dict[str, str] = {}
+        self.last_wait: float = 0.0
+        self.max_wait: float = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of polls waiting for a connection slot."""
+        return sum(self._waiting.values())
+
+    @property
+    def max_kept(self) -> int:
+        """Return how many devices per source may keep a connection open.
+
+        One slot is always left for the devices that connect per poll.
+        """
+        return max(self.max_connections - 1, 0)
+
+    @asynccontextmanager
+    async def async_slot(self, source: str | None) -> AsyncIterator[None]:
+        """Hold one of the connection slots of an adapter or proxy."""
+        slot = await self._async_acquire(source or "default")
+        try:
+            yield
+        finally:
+            slot.release()
+
+    async def _async_acquire(self, source: str) -> asyncio.Semaphore:
+        slot = self._slots.get(source)
+        if slot is None:
+            slot = self._slots[source] = asyncio.Semaphore(self.max_connections)
+        self._waiting[source] = self._waiting.get(source, 0) + 1
+        start = time.monotonic()
+        try:
+            await slot.acquire()
+        finally:
+            self._waiting[source] -= 1
+        wait = time.monotonic() - start
+        self.last_wait = wait
+        self.max_wait = max(self.max_wait, wait)
+        if wait > 1.0:
+            _LOGGER.debug("Waited %.1fs for a connection slot on %s", wait, source)
+        return slot
+
+    @callback
+    def _release_kept(self, address: str) -> None:
+        if (source := self._kept.pop(address, None)) is not None:
+            self._slots[source].release()
+
+    @asynccontextmanager
+    async def async_poll(
+        self,
+        address: str,
+        source: str | None,
+        connected: Callable[[], bool] | None = None,
+    ) -> AsyncIterator[bool]:
+        """Poll a device in a connection slot, then schedule its next poll.
+
+        A device that keeps its connection open between polls passes
+        ``connected``, which tells whether that connection is up. Its slot
+        stays taken for as long as it is, and later polls reuse it. Only
+        max_kept devices per source may do so; the context yields False to
+        the others, which should close their connection after the poll.
+        """
+        source = source or "default"
+        poll = self._polls.get(address)
+        if poll is not None:
+            poll.running = True
+        try:
+            if self._kept.get(address) == source:
+                yield True
+            else:
+                # The device moved to another adapter or proxy
+                self._release_kept(address)
+                keep = connected is not None and (
+                    sum(kept == source for kept in self._kept.values())
+                    < self.max_kept
+                )
+                slot = await self._async_acquire(source)
+                try:
+                    yield keep
+                finally:
+                    if keep and connected is not None and connected():
+                        self._kept[address] = source
+                    else:
+                        slot.release()
+        finally:
+            if connected is None or not connected():
+                self._release_kept(address)
+            if poll is not None:
+                poll.running = False
+                poll.schedule()
+
+    @callback
+    def async_add_device(
+        self,
+        address: str,
+        interval: timedelta,
+        action: Callable[[], Coroutine[Any, Any, Any]],
+        first_delay: float = MIN_POLL_DELAY,
+    ) -> CALLBACK_TYPE:
+        """Poll a device periodically; returns a callable that stops it.
+
+        ``action`` is called when a poll is due and should run the poll
+        inside async_poll, or skip it if the device is not around. The first
+        poll happens no sooner than ``first_delay`` seconds after setup,
+        staggered by address across one ``interval`` so devices don't all
+        connect at once.
+        """
+        poll = _ScheduledPoll(self, address, interval, action)
+        self._polls[address] = poll
+        poll.schedule(
+            max(first_delay, MIN_POLL_DELAY)
+            + stagger_offset(address, interval.total_seconds())
+        )
+
+        @callback
+        def _remove() -> None:
+            poll.cancel()
+            self._release_kept(address)
+            if self._polls.get(address) is poll:
+                del self._polls[address]
+
+        return _remove
+
+    @callback
+    def async_poll_due(self, address: str) -> bool:
+        """Return whether a device is due for a poll and none is running."""
+        return (poll := self._polls.get(address)) is not None and poll.is_due
+
+    @callback
+    def async_postpone(self, address: str, delay: float) -> None:
+        """Make a device's next poll due no sooner than ``delay`` seconds from now."""
+        if (poll := self._polls.get(address)) is None:
+            return
+        if time.monotonic() + delay > poll.due:
+            poll.schedule(delay)
+
+    @callback
+    def async_set_interval(self, address: str, interval: timedelta) -> None:
+        """Change the poll interval of a device.
+
+        Called during a poll, the next one follows it by ``interval``.
+        Otherwise the next poll is moved to ``interval`` from now.
+        """
+        if (poll := self._polls.get(address)) is None or poll.interval == interval:
+            return
+        poll.interval = interval
+        if poll._task is None and not poll.running:
+            poll.schedule()
+
+    def stats(self) -> dict[str, Any]:
+        """Return queue statistics."""
+        return {
+            "devices": len(self._polls),
+            "polling": sum(poll.running for poll in self._polls.values()),
+            "kept_connections": len(self._kept),
+            "queue_depth": self.queue_depth,
+            "waiting": {
+                source: count for source, count in self._waiting.items() if count
+            },
+            "last_wait": round(self.last_wait, 3),
+            "max_wait": round(self.max_wait, 3),
+        }
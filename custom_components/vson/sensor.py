@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
-from typing import cast
-from functools import partial
-from .vson_ble import SensorDeviceClass as VsonSensorDeviceClass, SensorUpdate, Units
-from .vson_ble.const import (
-    ExtendedSensorDeviceClass as VsonExtendedSensorDeviceClass,
-)
+from dataclasses import dataclass
+import time
+from typing import Any
+
+from .vson_ble import SensorDeviceClass as VsonSensorDeviceClass, Units
+from .vson_ble.breaker import STATES as CONNECTION_STATES
+from .vson_ble.const import ExtendedSensorDeviceClass
 
 from homeassistant.components.bluetooth.passive_update_processor import (
     PassiveBluetoothDataUpdate,
@@ -24,394 +25,132 @@ from homeassistant.const import (
     ATTR_HW_VERSION,
     CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
     CONCENTRATION_PARTS_PER_MILLION,
-    DEGREE,
-    LIGHT_LUX,
-    PERCENTAGE,
     SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
     EntityCategory,
-    UnitOfConductivity,
-    UnitOfElectricCurrent,
-    UnitOfElectricPotential,
-    UnitOfEnergy,
-    UnitOfLength,
-    UnitOfMass,
-    UnitOfPower,
-    UnitOfPressure,
-    UnitOfSpeed,
     UnitOfTemperature,
     UnitOfTime,
-    UnitOfVolume,
-    UnitOfVolumeFlowRate,
 )
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.sensor import sensor_device_info_to_hass_device_info
 
 from .coordinator import VsonPassiveBluetoothDataProcessor
-from .device import device_key_to_bluetooth_entity_key
+from .device import VsonDataUpdateConverter
 from .types import VsonConfigEntry
 
+# A different value inside the deadband is still written after this long
+MAX_SILENCE = 900
+
+
+@dataclass(frozen=True, kw_only=True)
+class VsonSensorEntityDescription(SensorEntityDescription):
+    """Describes a Vson sensor and when its changes are worth a state write.
+
+    A new value is written once it differs from the last written value by at
+    least ``deadband_abs`` or ``deadband_rel`` times that value, whichever is
+    larger. A different value inside that band is still written once
+    ``max_silence`` seconds have passed since the last write; an unchanged
+    value is never written again.
+    """
+
+    deadband_abs: float = 0
+    deadband_rel: float = 0
+    max_silence: float | None = MAX_SILENCE
+
+
+# Only the sensors a supported model (WP6003) actually reports, plus the
+# poll diagnostics
 SENSOR_DESCRIPTIONS = {
-    # Acceleration (m/s²)
-    (
-        VsonSensorDeviceClass.ACCELERATION,
-        Units.ACCELERATION_METERS_PER_SQUARE_SECOND,
-    ): SensorEntityDescription(
-        key=f"{VsonSensorDeviceClass.ACCELERATION}_{Units.ACCELERATION_METERS_PER_SQUARE_SECOND}",
-        native_unit_of_measurement=Units.ACCELERATION_METERS_PER_SQUARE_SECOND,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    # Battery (percent)
-    (VsonSensorDeviceClass.BATTERY, Units.PERCENTAGE): SensorEntityDescription(
-        key=f"{VsonSensorDeviceClass.BATTERY}_{Units.PERCENTAGE}",
-        device_class=SensorDeviceClass.BATTERY,
-        native_unit_of_measurement=PERCENTAGE,
-        state_class=SensorStateClass.MEASUREMENT,
-        entity_category=EntityCategory.DIAGNOSTIC,
-    ),
-    # Channel (-)
-    (VsonExtendedSensorDeviceClass.CHANNEL, None): SensorEntityDescription(
-        key=str(VsonExtendedSensorDeviceClass.CHANNEL),
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    # Conductivity (µS/cm)
-    (
-        VsonSensorDeviceClass.CONDUCTIVITY,
-        Units.CONDUCTIVITY,
-    ): SensorEntityDescription(
-        key=f"{VsonSensorDeviceClass.CONDUCTIVITY}_{Units.CONDUCTIVITY}",
-        device_class=SensorDeviceClass.CONDUCTIVITY,
-        native_unit_of_measurement=UnitOfConductivity.MICROSIEMENS_PER_CM,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    # Count (-)
-    (VsonSensorDeviceClass.COUNT, None): SensorEntityDescription(
-        key=str(VsonSensorDeviceClass.COUNT),
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
     # CO2 (parts per million)
     (
         VsonSensorDeviceClass.CO2,
         Units.CONCENTRATION_PARTS_PER_MILLION,
-    ): SensorEntityDescription(
+    ): VsonSensorEntityDescription(
         key=f"{VsonSensorDeviceClass.CO2}_{Units.CONCENTRATION_PARTS_PER_MILLION}",
         device_class=SensorDeviceClass.CO2,
         native_unit_of_measurement=CONCENTRATION_PARTS_PER_MILLION,
         state_class=SensorStateClass.MEASUREMENT,
-    ),
-    # Current (Ampere)
-    (
-        VsonSensorDeviceClass.CURRENT,
-        Units.ELECTRIC_CURRENT_AMPERE,
-    ): SensorEntityDescription(
-        key=f"{VsonSensorDeviceClass.CURRENT}_{Units.ELECTRIC_CURRENT_AMPERE}",
-        device_class=SensorDeviceClass.CURRENT,
-        native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    # Dew Point (°C)
-    (VsonSensorDeviceClass.DEW_POINT, Units.TEMP_CELSIUS): SensorEntityDescription(
-        key=f"{VsonSensorDeviceClass.DEW_POINT}_{Units.TEMP_CELSIUS}",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    # Directions (°)
-    (VsonExtendedSensorDeviceClass.DIRECTION, Units.DEGREE): SensorEntityDescription(
-        key=f"{VsonExtendedSensorDeviceClass.DIRECTION}_{Units.DEGREE}",
-        native_unit_of_measurement=DEGREE,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    # Distance (mm)
-    (
-        VsonSensorDeviceClass.DISTANCE,
-        Units.LENGTH_MILLIMETERS,
-    ): SensorEntityDescription(
-        key=f"{VsonSensorDeviceClass.DISTANCE}_{Units.LENGTH_MILLIMETERS}",
-        device_class=SensorDeviceClass.DISTANCE,
-        native_unit_of_measurement=UnitOfLength.MILLIMETERS,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    # Distance (m)
-    (VsonSensorDeviceClass.DISTANCE, Units.LENGTH_METERS): SensorEntityDescription(
-        key=f"{VsonSensorDeviceClass.DISTANCE}_{Units.LENGTH_METERS}",
-        device_class=SensorDeviceClass.DISTANCE,
-        native_unit_of_measurement=UnitOfLength.METERS,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    # Duration (seconds)
-    (VsonSensorDeviceClass.DURATION, Units.TIME_SECONDS): SensorEntityDescription(
-        key=f"{VsonSensorDeviceClass.DURATION}_{Units.TIME_SECONDS}",
-        device_class=SensorDeviceClass.DURATION,
-        native_unit_of_measurement=UnitOfTime.SECONDS,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    # Energy (kWh)
-    (
-        VsonSensorDeviceClass.ENERGY,
-        Units.ENERGY_KILO_WATT_HOUR,
-    ): SensorEntityDescription(
-        key=f"{VsonSensorDeviceClass.ENERGY}_{Units.ENERGY_KILO_WATT_HOUR}",
-        device_class=SensorDeviceClass.ENERGY,
-        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
-        state_class=SensorStateClass.TOTAL,
-    ),
-    # Gas (m3)
-    (
-        VsonSensorDeviceClass.GAS,
-        Units.VOLUME_CUBIC_METERS,
-    ): SensorEntityDescription(
-        key=f"{VsonSensorDeviceClass.GAS}_{Units.VOLUME_CUBIC_METERS}",
-        device_class=SensorDeviceClass.GAS,
-        native_unit_of_measurement=UnitOfVolume.CUBIC_METERS,
-        state_class=SensorStateClass.TOTAL,
-    ),
-    # Gyroscope (°/s)
-    (
-        VsonSensorDeviceClass.GYROSCOPE,
-        Units.GYROSCOPE_DEGREES_PER_SECOND,
-    ): SensorEntityDescription(
-        key=f"{VsonSensorDeviceClass.GYROSCOPE}_{Units.GYROSCOPE_DEGREES_PER_SECOND}",
-        native_unit_of_measurement=Units.GYROSCOPE_DEGREES_PER_SECOND,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    # Humidity in (percent)
-    (VsonSensorDeviceClass.HUMIDITY, Units.PERCENTAGE): SensorEntityDescription(
-        key=f"{VsonSensorDeviceClass.HUMIDITY}_{Units.PERCENTAGE}",
-        device_class=SensorDeviceClass.HUMIDITY,
-        native_unit_of_measurement=PERCENTAGE,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    # Illuminance (lux)
-    (VsonSensorDeviceClass.ILLUMINANCE, Units.LIGHT_LUX): SensorEntityDescription(
-        key=f"{VsonSensorDeviceClass.ILLUMINANCE}_{Units.LIGHT_LUX}",
-        device_class=SensorDeviceClass.ILLUMINANCE,
-        native_unit_of_measurement=LIGHT_LUX,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    # Mass sensor (kg)
-    (VsonSensorDeviceClass.MASS, Units.MASS_KILOGRAMS): SensorEntityDescription(
-        key=f"{VsonSensorDeviceClass.MASS}_{Units.MASS_KILOGRAMS}",
-        device_class=SensorDeviceClass.WEIGHT,
-        native_unit_of_measurement=UnitOfMass.KILOGRAMS,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    # Mass sensor (lb)
-    (VsonSensorDeviceClass.MASS, Units.MASS_POUNDS): SensorEntityDescription(
-        key=f"{VsonSensorDeviceClass.MASS}_{Units.MASS_POUNDS}",
-        device_class=SensorDeviceClass.WEIGHT,
-        native_unit_of_measurement=UnitOfMass.POUNDS,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    # Moisture (percent)
-    (VsonSensorDeviceClass.MOISTURE, Units.PERCENTAGE): SensorEntityDescription(
-        key=f"{VsonSensorDeviceClass.MOISTURE}_{Units.PERCENTAGE}",
-        device_class=SensorDeviceClass.MOISTURE,
-        native_unit_of_measurement=PERCENTAGE,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    # Packet Id (-)
-    (VsonSensorDeviceClass.PACKET_ID, None): SensorEntityDescription(
-        key=str(VsonSensorDeviceClass.PACKET_ID),
-        state_class=SensorStateClass.MEASUREMENT,
-        entity_category=EntityCategory.DIAGNOSTIC,
-        entity_registry_enabled_default=False,
-    ),
-    # PM10 (µg/m3)
-    (
-        VsonSensorDeviceClass.PM10,
-        Units.CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
-    ): SensorEntityDescription(
-        key=f"{VsonSensorDeviceClass.PM10}_{Units.CONCENTRATION_MICROGRAMS_PER_CUBIC_METER}",
-        device_class=SensorDeviceClass.PM10,
-        native_unit_of_measurement=CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    # PM2.5 (µg/m3)
-    (
-        VsonSensorDeviceClass.PM25,
-        Units.CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
-    ): SensorEntityDescription(
-        key=f"{VsonSensorDeviceClass.PM25}_{Units.CONCENTRATION_MICROGRAMS_PER_CUBIC_METER}",
-        device_class=SensorDeviceClass.PM25,
-        native_unit_of_measurement=CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    # Power (Watt)
-    (VsonSensorDeviceClass.POWER, Units.POWER_WATT): SensorEntityDescription(
-        key=f"{VsonSensorDeviceClass.POWER}_{Units.POWER_WATT}",
-        device_class=SensorDeviceClass.POWER,
-        native_unit_of_measurement=UnitOfPower.WATT,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    # Precipitation (mm)
-    (
-        VsonExtendedSensorDeviceClass.PRECIPITATION,
-        Units.LENGTH_MILLIMETERS,
-    ): SensorEntityDescription(
-        key=f"{VsonExtendedSensorDeviceClass.PRECIPITATION}_{Units.LENGTH_MILLIMETERS}",
-        device_class=SensorDeviceClass.PRECIPITATION,
-        native_unit_of_measurement=UnitOfLength.MILLIMETERS,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    # Pressure (mbar)
-    (VsonSensorDeviceClass.PRESSURE, Units.PRESSURE_MBAR): SensorEntityDescription(
-        key=f"{VsonSensorDeviceClass.PRESSURE}_{Units.PRESSURE_MBAR}",
-        device_class=SensorDeviceClass.PRESSURE,
-        native_unit_of_measurement=UnitOfPressure.MBAR,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    # Raw (-)
-    (VsonExtendedSensorDeviceClass.RAW, None): SensorEntityDescription(
-        key=str(VsonExtendedSensorDeviceClass.RAW),
-    ),
-    # Rotation (°)
-    (VsonSensorDeviceClass.ROTATION, Units.DEGREE): SensorEntityDescription(
-        key=f"{VsonSensorDeviceClass.ROTATION}_{Units.DEGREE}",
-        native_unit_of_measurement=DEGREE,
-        state_class=SensorStateClass.MEASUREMENT,
+        # the reading jitters by a few ppm
+        deadband_abs=5,
+        deadband_rel=0.01,
     ),
     # Signal Strength (RSSI) (dB)
     (
         VsonSensorDeviceClass.SIGNAL_STRENGTH,
         Units.SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
-    ): SensorEntityDescription(
+    ): VsonSensorEntityDescription(
         key=f"{VsonSensorDeviceClass.SIGNAL_STRENGTH}_{Units.SIGNAL_STRENGTH_DECIBELS_MILLIWATT}",
         device_class=SensorDeviceClass.SIGNAL_STRENGTH,
         native_unit_of_measurement=SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
         entity_registry_enabled_default=False,
-    ),
-    # Speed (m/s)
-    (
-        VsonSensorDeviceClass.SPEED,
-        Units.SPEED_METERS_PER_SECOND,
-    ): SensorEntityDescription(
-        key=f"{VsonSensorDeviceClass.SPEED}_{Units.SPEED_METERS_PER_SECOND}",
-        device_class=SensorDeviceClass.SPEED,
-        native_unit_of_measurement=UnitOfSpeed.METERS_PER_SECOND,
-        state_class=SensorStateClass.MEASUREMENT,
+        deadband_abs=3,
     ),
     # Temperature (°C)
-    (VsonSensorDeviceClass.TEMPERATURE, Units.TEMP_CELSIUS): SensorEntityDescription(
+    (VsonSensorDeviceClass.TEMPERATURE, Units.TEMP_CELSIUS): VsonSensorEntityDescription(
         key=f"{VsonSensorDeviceClass.TEMPERATURE}_{Units.TEMP_CELSIUS}",
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
-    ),
-    # Text (-)
-    (VsonExtendedSensorDeviceClass.TEXT, None): SensorEntityDescription(
-        key=str(VsonExtendedSensorDeviceClass.TEXT),
-    ),
-    # Timestamp (datetime object)
-    (
-        VsonSensorDeviceClass.TIMESTAMP,
-        None,
-    ): SensorEntityDescription(
-        key=str(VsonSensorDeviceClass.TIMESTAMP),
-        device_class=SensorDeviceClass.TIMESTAMP,
-    ),
-    # UV index (-)
-    (
-        VsonSensorDeviceClass.UV_INDEX,
-        None,
-    ): SensorEntityDescription(
-        key=str(VsonSensorDeviceClass.UV_INDEX),
-        state_class=SensorStateClass.MEASUREMENT,
+        deadband_abs=0.2,
     ),
     # Volatile organic Compounds (VOC) (µg/m3)
     (
         VsonSensorDeviceClass.VOLATILE_ORGANIC_COMPOUNDS,
         Units.CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
-    ): SensorEntityDescription(
+    ): VsonSensorEntityDescription(
         key=f"{VsonSensorDeviceClass.VOLATILE_ORGANIC_COMPOUNDS}_{Units.CONCENTRATION_MICROGRAMS_PER_CUBIC_METER}",
         device_class=SensorDeviceClass.VOLATILE_ORGANIC_COMPOUNDS,
         native_unit_of_measurement=CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
         state_class=SensorStateClass.MEASUREMENT,
+        # ignore flips of the last rounded digit
+        deadband_abs=0.02,
+        deadband_rel=0.05,
     ),
-    # Voltage (volt)
-    (
-        VsonSensorDeviceClass.VOLTAGE,
-        Units.ELECTRIC_POTENTIAL_VOLT,
-    ): SensorEntityDescription(
-        key=f"{VsonSensorDeviceClass.VOLTAGE}_{Units.ELECTRIC_POTENTIAL_VOLT}",
-        device_class=SensorDeviceClass.VOLTAGE,
-        native_unit_of_measurement=UnitOfElectricPotential.VOLT,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    # Volume (L)
-    (
-        VsonSensorDeviceClass.VOLUME,
-        Units.VOLUME_LITERS,
-    ): SensorEntityDescription(
-        key=f"{VsonSensorDeviceClass.VOLUME}_{Units.VOLUME_LITERS}",
-        device_class=SensorDeviceClass.VOLUME,
-        native_unit_of_measurement=UnitOfVolume.LITERS,
-        state_class=SensorStateClass.TOTAL,
-    ),
-    # Volume (mL)
-    (
-        VsonSensorDeviceClass.VOLUME,
-        Units.VOLUME_MILLILITERS,
-    ): SensorEntityDescription(
-        key=f"{VsonSensorDeviceClass.VOLUME}_{Units.VOLUME_MILLILITERS}",
-        device_class=SensorDeviceClass.VOLUME,
-        native_unit_of_measurement=UnitOfVolume.MILLILITERS,
-        state_class=SensorStateClass.TOTAL,
-    ),
-    # Volume Flow Rate (m3/hour)
-    (
-        VsonSensorDeviceClass.VOLUME_FLOW_RATE,
-        Units.VOLUME_FLOW_RATE_CUBIC_METERS_PER_HOUR,
-    ): SensorEntityDescription(
-        key=f"{VsonSensorDeviceClass.VOLUME_FLOW_RATE}_{Units.VOLUME_FLOW_RATE_CUBIC_METERS_PER_HOUR}",
-        device_class=SensorDeviceClass.VOLUME_FLOW_RATE,
-        native_unit_of_measurement=UnitOfVolumeFlowRate.CUBIC_METERS_PER_HOUR,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    # Volume Storage (L)
-    (
-        VsonExtendedSensorDeviceClass.VOLUME_STORAGE,
-        Units.VOLUME_LITERS,
-    ): SensorEntityDescription(
-        key=f"{VsonExtendedSensorDeviceClass.VOLUME_STORAGE}_{Units.VOLUME_LITERS}",
-        device_class=SensorDeviceClass.VOLUME_STORAGE,
-        native_unit_of_measurement=UnitOfVolume.LITERS,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    # Water (L)
-    (
-        VsonSensorDeviceClass.WATER,
-        Units.VOLUME_LITERS,
-    ): SensorEntityDescription(
-        key=f"{VsonSensorDeviceClass.WATER}_{Units.VOLUME_LITERS}",
-        device_class=SensorDeviceClass.WATER,
-        native_unit_of_measurement=UnitOfVolume.LITERS,
-        state_class=SensorStateClass.TOTAL,
-    ),
-    # # TVOC (µg/m3)
-    # (
-    #     VsonSensorDeviceClass.VOLATILE_ORGANIC_COMPOUNDS,
-    #     Units.CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
-    # ): SensorEntityDescription(
-    #     key=f"{VsonSensorDeviceClass.VOLATILE_ORGANIC_COMPOUNDS}_{Units.CONCENTRATION_MICROGRAMS_PER_CUBIC_METER}",
-    #     device_class=SensorDeviceClass.VOLATILE_ORGANIC_COMPOUNDS,
-    #     native_unit_of_measurement=CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
-    #     state_class=SensorStateClass.MEASUREMENT,
-    # ),
     # HCHO (µg/m3)
     (
         VsonSensorDeviceClass.FORMALDEHYDE,
         Units.CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
-    ): SensorEntityDescription(
+    ): VsonSensorEntityDescription(
         key=f"{VsonSensorDeviceClass.FORMALDEHYDE}_{Units.CONCENTRATION_MICROGRAMS_PER_CUBIC_METER}",
         device_class=SensorDeviceClass.VOLATILE_ORGANIC_COMPOUNDS,
         native_unit_of_measurement=CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
         state_class=SensorStateClass.MEASUREMENT,
+        deadband_abs=0.02,
+        deadband_rel=0.05,
+    ),
+    # Poll duration percentiles (s)
+    (VsonSensorDeviceClass.DURATION, Units.TIME_SECONDS): VsonSensorEntityDescription(
+        key=f"{VsonSensorDeviceClass.DURATION}_{Units.TIME_SECONDS}",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    # Poll outcome counters
+    (VsonSensorDeviceClass.COUNT, None): VsonSensorEntityDescription(
+        key=str(VsonSensorDeviceClass.COUNT),
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    # Circuit breaker state of the connection
+    (ExtendedSensorDeviceClass.ENUM, None): VsonSensorEntityDescription(
+        key=str(ExtendedSensorDeviceClass.ENUM),
+        device_class=SensorDeviceClass.ENUM,
+        options=list(CONNECTION_STATES),
+        entity_category=EntityCategory.DIAGNOSTIC,
     ),
 }
 
+# Restored entities get a plain SensorEntityDescription, so look these up by key
+DEADBANDS: dict[str, VsonSensorEntityDescription] = {
+    description.key: description for description in SENSOR_DESCRIPTIONS.values()
+}
+
+
 def hass_device_info(sensor_device_info):
     device_info = sensor_device_info_to_hass_device_info(sensor_device_info)
     if sensor_device_info.sw_version is not None:
@@ -419,33 +158,12 @@ def hass_device_info(sensor_device_info):
     if sensor_device_info.hw_version is not None:
         device_info[ATTR_HW_VERSION] = sensor_device_info.hw_version
     return device_info
-    
-def sensor_update_to_bluetooth_data_update(
-    sensor_update: SensorUpdate,
-) -> PassiveBluetoothDataUpdate[float | None]:
-    """Convert a sensor update to a bluetooth data update."""
-    return PassiveBluetoothDataUpdate(
-        devices={
-            device_id: hass_device_info(device_info)
-            for device_id, device_info in sensor_update.devices.items()
-        },
-        entity_descriptions={
-            device_key_to_bluetooth_entity_key(device_key): SENSOR_DESCRIPTIONS[
-                (description.device_class, description.native_unit_of_measurement)
-            ]
-            for device_key, description in sensor_update.entity_descriptions.items()
-            if description.device_class
-        },
-        entity_data={
-            device_key_to_bluetooth_entity_key(device_key): cast(
-                float | None, sensor_values.native_value
-            )
-            for device_key, sensor_values in sensor_update.entity_values.items()
-        },
-        entity_names={
-            device_key_to_bluetooth_entity_key(device_key): sensor_values.name
-            for device_key, sensor_values in sensor_update.entity_values.items()
-        },
+
+
+def sensor_description(description) -> SensorEntityDescription | None:
+    """Return the entity description for a sensor description."""
+    return SENSOR_DESCRIPTIONS.get(
+        (description.device_class, description.native_unit_of_measurement)
     )
 
 
@@ -457,7 +175,7 @@ async def async_setup_entry(
     """Set up the Vson BLE sensors."""
     coordinator = entry.runtime_data
     processor = VsonPassiveBluetoothDataProcessor(
-        sensor_update_to_bluetooth_data_update
+        VsonDataUpdateConverter[float | None](sensor_description, hass_device_info)
     )
     entry.async_on_unload(
         processor.async_add_entities_listener(
@@ -475,6 +193,50 @@ class VsonBluetoothSensorEntity(
 ):
     """Representation of a Vson BLE sensor."""
 
+    _written_value: Any = None
+    _written_available: bool = False
+    _written_at: float = 0
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the state written when the entity is added."""
+        await super().async_added_to_hass()
+        self._mark_written()
+
+    def _mark_written(self) -> None:
+        self._written_value = self.native_value
+        self._written_available = self.available
+        self._written_at = time.monotonic()
+
+    def _should_write(self) -> bool:
+        """Return if the current value is worth a state write."""
+        if self.available != self._written_available:
+            return True
+        value = self.native_value
+        last = self._written_value
+        if value == last:
+            return False
+        if not isinstance(value, (int, float)) or not isinstance(last, (int, float)):
+            return True
+        if (description := DEADBANDS.get(self.entity_description.key)) is None:
+            return True
+        if (
+            description.max_silence is not None
+            and time.monotonic() - self._written_at >= description.max_silence
+        ):
+            return True
+        return abs(value - last) >= max(
+            description.deadband_abs, description.deadband_rel * abs(last)
+        )
+
+    @callback
+    def _handle_processor_update(
+        self, new_data: PassiveBluetoothDataUpdate[Any] | None
+    ) -> None:
+        """Write the state only for changes outside the deadband."""
+        if self._should_write():
+            self._mark_written()
+            self.async_write_ha_state()
+
     @property
     def native_value(self) -> int | float | None:
         """Return the native value."""
@@ -484,9 +246,3 @@ class VsonBluetoothSensorEntity(
     def available(self) -> bool:
         """Return True if entity is available."""
         return super().available
-
-    async def async_added_to_hass(self) -> None:
-        await super().async_added_to_hass()
-        poll_coordinator = self.processor.coordinator.poll_coordinator
-        remove = poll_coordinator.async_add_listener(partial(self.processor.async_handle_update, poll_coordinator.data))
-        self.async_on_remove(remove)
\ No newline at end of file
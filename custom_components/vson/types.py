@@ -5,6 +5,6 @@ from typing import TYPE_CHECKING
 from homeassistant.config_entries import ConfigEntry
 
 if TYPE_CHECKING:
-    from .coordinator import VsonPassiveBluetoothProcessorCoordinator
+    from .coordinator import VsonActiveBluetoothProcessorCoordinator
 
-type VsonConfigEntry = ConfigEntry[VsonPassiveBluetoothProcessorCoordinator]
+type VsonConfigEntry = ConfigEntry[VsonActiveBluetoothProcessorCoordinator]
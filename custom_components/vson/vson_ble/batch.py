@@ -0,0 +1,106 @@
+"""Vectorised decoding of many WP6003 frames at once.
+
+Not imported by the package itself so numpy is only loaded by callers that
+replay or backfill captured frames.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import cache
+
+import numpy as np
+
+from .decoder import FRAME_HEADER, FRAME_LENGTH
+
+FRAME_DTYPE = np.dtype(
+    [
+        ("header", "u1"),
+        ("_pad0", "V5"),
+        ("temperature", ">u2"),
+        ("_pad1", "V2"),
+        ("tvoc", ">u2"),
+        ("hcho", ">u2"),
+        ("_pad2", "V2"),
+        ("co2", ">u2"),
+    ]
+)
+assert FRAME_DTYPE.itemsize == FRAME_LENGTH
+
+
+@dataclass(frozen=True, slots=True)
+class Wp6003Columns:
+    """Decoded readings, one element per frame; malformed frames are masked."""
+
+    temperature: np.ma.MaskedArray
+    tvoc: np.ma.MaskedArray
+    hcho: np.ma.MaskedArray
+    co2: np.ma.MaskedArray
+    valid: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+
+@cache
+def _rounded(divisor: int) -> np.ndarray:
+    """Return round(raw / divisor, 2) for every 16 bit word.
+
+    The table is filled with Python's own round() so the result is identical
+    to the scalar decoder, which numpy's half-even rounding of x * 100 is not.
+    """
+    return np.array(
+        [round(raw / divisor, 2) for raw in range(0x10000)], dtype=np.float64
+    )
+
+
+def _rows(
+    data: bytes | bytearray | memoryview | np.ndarray | Sequence[bytes],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the frames as structured rows plus a mask of well formed rows."""
+    if isinstance(data, (list, tuple)):
+        buffer = np.zeros((len(data), FRAME_LENGTH), dtype=np.uint8)
+        sized = np.zeros(len(data), dtype=bool)
+        for index, frame in enumerate(data):
+            if len(frame) == FRAME_LENGTH:
+                buffer[index] = np.frombuffer(frame, dtype=np.uint8)
+                sized[index] = True
+        flat = buffer.reshape(-1)
+    else:
+        if isinstance(data, np.ndarray):
+            flat = np.ascontiguousarray(data, dtype=np.uint8).reshape(-1)
+        else:
+            flat = np.frombuffer(data, dtype=np.uint8)
+        count, tail = divmod(len(flat), FRAME_LENGTH)
+        sized = np.ones(count + bool(tail), dtype=bool)
+        if tail:
+            # Keep a trailing partial frame as a masked row
+            flat = np.concatenate(
+                [flat, np.zeros(FRAME_LENGTH - tail, dtype=np.uint8)]
+            )
+            sized[-1] = False
+    rows = flat.view(FRAME_DTYPE)
+    return rows, sized & (rows["header"] == FRAME_HEADER)
+
+
+def decode_frames(
+    data: bytes | bytearray | memoryview | np.ndarray | Sequence[bytes],
+) -> Wp6003Columns:
+    """Decode N frames in one pass.
+
+    ``data`` is either a contiguous buffer or uint8 array of back-to-back
+    18 byte frames, or a sequence of individual frames. Rows with a bad length
+    or header are masked instead of raising.
+    """
+    rows, valid = _rows(data)
+    invalid = ~valid
+    return Wp6003Columns(
+        temperature=np.ma.MaskedArray(
+            _rounded(10)[rows["temperature"]], mask=invalid
+        ),
+        tvoc=np.ma.MaskedArray(_rounded(1000)[rows["tvoc"]], mask=invalid),
+        hcho=np.ma.MaskedArray(_rounded(1000)[rows["hcho"]], mask=invalid),
+        co2=np.ma.MaskedArray(rows["co2"].astype(np.int64), mask=invalid),
+        valid=valid,
+    )
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+# Breaker states, also the options of the connection state sensor
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+STATES = (CLOSED, OPEN, HALF_OPEN)
+
+# Consecutive failures that open the breaker
+DEFAULT_THRESHOLD = 3
+# Seconds the breaker stays open the first time, doubling on every failed
+# probe up to the cap
+DEFAULT_BASE_DELAY = 60.0
+DEFAULT_MAX_DELAY = 3600.0
+DEFAULT_FACTOR = 2.0
+
+
+class CircuitBreaker:
+    """Stop polling a device that keeps failing, and probe it now and then.
+
+    Closed, every poll is allowed. ``threshold`` failures in a row open the
+    breaker and no poll is allowed for the backoff delay. Once it has passed
+    the breaker is half open: one poll probes the device, closing the
+    breaker on success and opening it again for a longer delay on failure.
+    """
+
+    def __init__(
+        self,
+        threshold: int = DEFAULT_THRESHOLD,
+        base_delay: float = DEFAULT_BASE_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        factor: float = DEFAULT_FACTOR,
+    ) -> None:
+        self.threshold = threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.state = CLOSED
+        # Consecutive failures, and how often the breaker opened since the
+        # last success
+        self.failures = 0
+        self.trips = 0
+        # Monotonic time from which a probe is allowed while open
+        self.retry_at: float | None = None
+
+    def allow(self, now: float | None = None) -> bool:
+        """Return whether a poll may run, going half open once the delay passed."""
+        if self.state == OPEN:
+            now = time.monotonic() if now is None else now
+            if self.retry_at is not None and now < self.retry_at:
+                return False
+            self.state = HALF_OPEN
+            _LOGGER.debug("Circuit half open, probing")
+        return True
+
+    def retry_in(self, now: float | None = None) -> float:
+        """Return the seconds until a probe is allowed, 0 if it already is."""
+        if self.state != OPEN or self.retry_at is None:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        return max(self.retry_at - now, 0.0)
+
+    def record_success(self) -> None:
+        if self.state != CLOSED:
+            _LOGGER.debug("Circuit closed after %s failures", self.failures)
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.retry_at = None
+
+    def record_failure(self, now: float | None = None) -> None:
+        self.failures += 1
+        if self.state == CLOSED and self.failures < self.threshold:
+            return
+        now = time.monotonic() if now is None else now
+        delay = min(self.base_delay * self.factor**self.trips, self.max_delay)
+        self.trips += 1
+        self.state = OPEN
+        self.retry_at = now + delay
+        _LOGGER.debug(
+            "Circuit open after %s failures, next probe in %.0fs",
+            self.failures,
+            delay,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "retry_in": round(self.retry_in(), 1),
+        }
@@ -0,0 +1,213 @@
+"""Append-only capture of raw frames and advertisements.
+
+A capture file starts with a magic number and holds records back to back:
+a header of kind, wall clock timestamp and body length, then the body. A
+frame body is the frame as received. An advertisement body packs the fields
+of the BluetoothServiceInfoBleak that the parser looks at. Version 1 files
+stored the address as 6 MAC bytes, which other platforms' addresses (e.g.
+CoreBluetooth UUIDs) don't fit; version 2 stores it as a string and both
+can be read.
+"""
+
+from __future__ import annotations
+
+import struct
+import time
+import uuid
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from bleak.backends.device import BLEDevice
+from home_assistant_bluetooth import BluetoothServiceInfoBleak
+
+MAGIC = b"VSC2"
+MAGIC_V1 = b"VSC1"
+KIND_FRAME = 1
+KIND_ADVERT = 2
+
+_RECORD = struct.Struct(">BdH")
+_U8 = struct.Struct(">B")
+_ADVERT = struct.Struct(">bB")
+_ADVERT_V1 = struct.Struct(">6sbB")
+_MANUFACTURER = struct.Struct(">HB")
+
+
+def _pack_str(value: str | None) -> bytes:
+    data = (value or "").encode()
+    if len(data) > 255:
+        # Cut on a character boundary so the string still decodes
+        data = data[:255].decode(errors="ignore").encode()
+    return _U8.pack(len(data)) + data
+
+
+def pack_advert(service_info: BluetoothServiceInfoBleak) -> bytes:
+    """Pack the fields of an advertisement the parser uses."""
+    parts = [
+        _pack_str(service_info.address),
+        _ADVERT.pack(
+            max(-128, min(127, service_info.rssi)),
+            service_info.connectable,
+        ),
+        _pack_str(service_info.name),
+        _pack_str(service_info.source),
+        _U8.pack(len(service_info.service_uuids)),
+    ]
+    parts.extend(uuid.UUID(value).bytes for value in service_info.service_uuids)
+    parts.append(_U8.pack(len(service_info.manufacturer_data)))
+    for company, data in service_info.manufacturer_data.items():
+        parts.append(_MANUFACTURER.pack(company, len(data)) + data)
+    parts.append(_U8.pack(len(service_info.service_data)))
+    for key, data in service_info.service_data.items():
+        parts.append(uuid.UUID(key).bytes + _U8.pack(len(data)) + data)
+    return b"".join(parts)
+
+
+class _Reader:
+    __slots__ = ("data", "offset")
+
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.offset = 0
+
+    def take(self, size: int) -> bytes:
+        chunk = self.data[self.offset : self.offset + size]
+        if len(chunk) != size:
+            raise ValueError("Truncated advertisement record")
+        self.offset += size
+        return chunk
+
+    def u8(self) -> int:
+        return self.take(1)[0]
+
+    def string(self) -> str:
+        return self.take(self.u8()).decode()
+
+
+def unpack_advert(
+    body: bytes, timestamp: float, version: int = 2
+) -> BluetoothServiceInfoBleak:
+    """Rebuild an advertisement packed by pack_advert."""
+    reader = _Reader(body)
+    if version == 1:
+        raw_address, rssi, connectable = _ADVERT_V1.unpack(
+            reader.take(_ADVERT_V1.size)
+        )
+        address = ":".join(f"{byte:02X}" for byte in raw_address)
+    else:
+        address = reader.string()
+        rssi, connectable = _ADVERT.unpack(reader.take(_ADVERT.size))
+    name = reader.string()
+    source = reader.string()
+    service_uuids = [str(uuid.UUID(bytes=reader.take(16))) for _ in range(reader.u8())]
+    manufacturer_data = {}
+    for _ in range(reader.u8()):
+        company, size = _MANUFACTURER.unpack(reader.take(_MANUFACTURER.size))
+        manufacturer_data[company] = reader.take(size)
+    service_data = {}
+    for _ in range(reader.u8()):
+        key = str(uuid.UUID(bytes=reader.take(16)))
+        service_data[key] = reader.take(reader.u8())
+    return BluetoothServiceInfoBleak(
+        name=name,
+        address=address,
+        rssi=rssi,
+        manufacturer_data=manufacturer_data,
+        service_data=service_data,
+        service_uuids=service_uuids,
+        source=source,
+        device=BLEDevice(address, name, None),
+        advertisement=None,
+        connectable=bool(connectable),
+        time=timestamp,
+        tx_power=None,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class CaptureRecord:
+    kind: int
+    timestamp: float
+    body: bytes
+    version: int = 2
+
+    @property
+    def advert(self) -> BluetoothServiceInfoBleak:
+        return unpack_advert(self.body, self.timestamp, self.version)
+
+
+def iter_records(data: bytes) -> Iterator[CaptureRecord]:
+    """Yield the records of a capture; a torn last record is skipped."""
+    if (magic := data[: len(MAGIC)]) not in (MAGIC, MAGIC_V1):
+        raise ValueError("Not a capture file")
+    version = 1 if magic == MAGIC_V1 else 2
+    offset = len(MAGIC)
+    while offset + _RECORD.size <= len(data):
+        kind, timestamp, size = _RECORD.unpack_from(data, offset)
+        offset += _RECORD.size
+        body = data[offset : offset + size]
+        if len(body) != size:
+            return
+        offset += size
+        yield CaptureRecord(kind, timestamp, body, version)
+
+
+class CaptureLog:
+    """Buffer records in memory and append them to a file.
+
+    Recording only touches memory, so it is safe in the event loop. Take the
+    buffered records with take() in the loop and pass them to write() in an
+    executor; flush() does both for synchronous callers.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.buffer = bytearray()
+        self.records = 0
+        # Whether an existing file was checked for the current format
+        self._checked = False
+
+    def _append(self, kind: int, body: bytes, timestamp: float | None) -> None:
+        self.buffer += _RECORD.pack(
+            kind, time.time() if timestamp is None else timestamp, len(body)
+        )
+        self.buffer += body
+        self.records += 1
+
+    def record_frame(self, data: bytes, timestamp: float | None = None) -> None:
+        self._append(KIND_FRAME, bytes(data), timestamp)
+
+    def record_advert(self, service_info: BluetoothServiceInfoBleak) -> None:
+        self._append(KIND_ADVERT, pack_advert(service_info), None)
+
+    def take(self) -> bytes:
+        """Return and clear the buffered records."""
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+    def write(self, data: bytes) -> None:
+        """Append records returned by take() to the file."""
+        if not data:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not self._checked:
+            self._set_aside_old_format()
+            self._checked = True
+        with self.path.open("ab") as file:
+            if file.tell() == 0:
+                file.write(MAGIC)
+            file.write(data)
+
+    def _set_aside_old_format(self) -> None:
+        """Move a file of another format aside rather than mix formats."""
+        try:
+            with self.path.open("rb") as file:
+                magic = file.read(len(MAGIC))
+        except FileNotFoundError:
+            return
+        if magic and magic != MAGIC:
+            self.path.replace(self.path.with_suffix(f".v1{self.path.suffix}"))
+
+    def flush(self) -> None:
+        self.write(self.take())
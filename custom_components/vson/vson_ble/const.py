@@ -6,6 +6,11 @@ TIMEOUT_5MIN = 5 * 60
 SERVICE_WP6003 = "0000fff0-0000-1000-8000-00805f9b34fb"
 CHAR_CMD = "0000fff1-0000-1000-8000-00805f9b34fb"
 CHAR_NOTI = "0000fff4-0000-1000-8000-00805f9b34fb"
+STREAM_QUEUE_SIZE = 32
+# Seconds to wait for a reading on a client without a Deadline
+READ_TIMEOUT = 5.0
+# Seconds a disconnect may take before it is left to finish on its own
+DISCONNECT_TIMEOUT = 5.0
 
 class ExtendedSensorDeviceClass(BaseDeviceClass):
     """Device class for additional sensors (compared to sensor-state-data)."""
@@ -13,6 +18,9 @@ class ExtendedSensorDeviceClass(BaseDeviceClass):
     # Data channel
     CHANNEL = "channel"
 
+    # One of a fixed set of states
+    ENUM = "enum"
+
     # Raw hex data
     RAW = "raw"
 
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager
+
+from bleak import BleakError
+
+# Seconds one transaction may take, from connecting to the reading
+DEFAULT_DEADLINE = 30.0
+
+# Share of the budget each phase of a transaction may use
+DEFAULT_SHARES: Mapping[str, float] = {
+    "connect": 0.6,
+    "subscribe": 0.1,
+    "write": 0.1,
+    "read": 0.2,
+}
+
+
+class DeadlineExceeded(BleakError, TimeoutError):
+    """A phase of a transaction ran out of its budget."""
+
+
+class Deadline:
+    """A total time budget for one BLE transaction, split across its phases.
+
+    Each phase may take its share of the total, and never runs past the
+    end of the total, so a phase that is repeated, e.g. connecting again
+    after the link dropped, only gets what is left. A phase that runs out
+    is cancelled and raises DeadlineExceeded.
+    """
+
+    def __init__(
+        self, total: float, shares: Mapping[str, float] = DEFAULT_SHARES
+    ) -> None:
+        self.total = total
+        self.shares = shares
+        self._loop = asyncio.get_running_loop()
+        self.when = self._loop.time() + total
+
+    def remaining(self) -> float:
+        return max(self.when - self._loop.time(), 0.0)
+
+    def budget(self, phase: str) -> float:
+        """Return the seconds ``phase`` may take if it starts now."""
+        remaining = self.remaining()
+        if (share := self.shares.get(phase)) is None:
+            return remaining
+        return min(self.total * share, remaining)
+
+    @asynccontextmanager
+    async def phase(self, phase: str) -> AsyncIterator[None]:
+        """Bound the body by the budget of ``phase``."""
+        budget = self.budget(phase)
+        timeout = asyncio.timeout(budget)
+        try:
+            async with timeout:
+                yield
+        except TimeoutError as err:
+            if not timeout.expired():
+                raise
+            raise DeadlineExceeded(
+                f"{phase} took longer than its {budget:.1f}s"
+                f" of the {self.total:.0f}s deadline"
+            ) from err
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import struct
+import time
+from collections.abc import Iterator
+
+FRAME_LENGTH = 18
+FRAME_HEADER = 0x0A
+
+# header, 5 pad, temperature, 2 pad, tvoc, hcho, 2 pad, co2
+WP6003_FRAME = struct.Struct(">B5xH2xHH2xH")
+FIELDS = ("temperature", "tvoc", "hcho", "co2")
+# year since 2000, month, day, hour, minute of the device clock
+FRAME_CLOCK = struct.Struct(">5B")
+
+
+class FrameError(ValueError):
+    """Frame has the wrong length or header."""
+
+
+class Wp6003Frame:
+    """A WP6003 reading, unpacked from its buffer on first access.
+
+    The frame keeps a view on the buffer it was decoded from, so the buffer
+    must not be modified while the frame is in use.
+    """
+
+    __slots__ = ("_view", "_raw", "_values")
+
+    def __init__(self, view: memoryview) -> None:
+        self._view = view
+        self._raw: tuple[int, int, int, int] | None = None
+        self._values: tuple[float, float, float, int] | None = None
+
+    @property
+    def raw(self) -> tuple[int, int, int, int]:
+        """Return the raw temperature, TVOC, HCHO and CO2 words."""
+        if (raw := self._raw) is None:
+            raw = self._raw = WP6003_FRAME.unpack_from(self._view)[1:]
+        return raw
+
+    @property
+    def values(self) -> tuple[float, float, float, int]:
+        """Return temperature (°C), TVOC, HCHO and CO2 (ppm), scaled and rounded."""
+        if (values := self._values) is None:
+            temperature, tvoc, hcho, co2 = self.raw
+            values = self._values = (
+                round(temperature / 10, 2),
+                round(tvoc / 1000, 2),
+                round(hcho / 1000, 2),
+                co2,
+            )
+        return values
+
+    @property
+    def temperature(self) -> float:
+        return self.values[0]
+
+    @property
+    def tvoc(self) -> float:
+        return self.values[1]
+
+    @property
+    def hcho(self) -> float:
+        return self.values[2]
+
+    @property
+    def co2(self) -> int:
+        return self.values[3]
+
+    def as_dict(self) -> dict[str, float]:
+        return dict(zip(FIELDS, self.values))
+
+    def __repr__(self) -> str:
+        return f"Wp6003Frame({bytes(self._view).hex()})"
+
+
+def _check(view: memoryview) -> Wp6003Frame:
+    if len(view) != FRAME_LENGTH:
+        raise FrameError(f"Expected {FRAME_LENGTH} bytes, got {len(view)}")
+    if view[0] != FRAME_HEADER:
+        raise FrameError(f"Unexpected frame header 0x{view[0]:02x}")
+    return Wp6003Frame(view)
+
+
+def decode_frame(data: bytes | bytearray | memoryview) -> Wp6003Frame:
+    """Validate and wrap a single frame without copying it."""
+    return _check(memoryview(data))
+
+
+def iter_frames(data: bytes | bytearray | memoryview) -> Iterator[Wp6003Frame]:
+    """Decode back-to-back frames from one contiguous buffer."""
+    view = memoryview(data)
+    for offset in range(0, len(view), FRAME_LENGTH):
+        yield _check(view[offset : offset + FRAME_LENGTH])
+
+
+def encode_frame(
+    temperature: float,
+    tvoc: float,
+    hcho: float,
+    co2: int,
+    timestamp: float | None = None,
+) -> bytes:
+    """Build the frame a WP6003 sends for a reading, the inverse of decode_frame."""
+    buffer = bytearray(
+        WP6003_FRAME.pack(
+            FRAME_HEADER,
+            round(temperature * 10),
+            round(tvoc * 1000),
+            round(hcho * 1000),
+            co2,
+        )
+    )
+    clock = time.localtime(timestamp)
+    FRAME_CLOCK.pack_into(
+        buffer,
+        1,
+        clock.tm_year % 100,
+        clock.tm_mon,
+        clock.tm_mday,
+        clock.tm_hour,
+        clock.tm_min,
+    )
+    return bytes(buffer)
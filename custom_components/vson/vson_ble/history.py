@@ -0,0 +1,355 @@
+"""Compressed history of WP6003 readings.
+
+Samples are kept in blocks compressed the way Gorilla does it: timestamps as
+delta-of-delta with variable length prefixes and the raw 16 bit words of each
+field XORed with the previous value of the same field. A reading that did not
+change costs one bit per field, a poll on schedule one bit for the timestamp.
+"""
+
+from __future__ import annotations
+
+import struct
+from collections import deque
+from collections.abc import Iterator, Sequence
+
+from .decoder import FIELDS
+
+# A block is closed and a new one started after this many seconds, so old
+# samples can be dropped a block at a time
+BLOCK_SPAN = 6 * 3600
+DEFAULT_RETENTION = 30 * 86400
+
+WORD_BITS = 16
+# Scale of each raw word, as in Wp6003Frame.values
+SCALES = (10, 1000, 1000, 1)
+
+_MAGIC = b"VSH1"
+_FILE_HEADER = struct.Struct(">4sI")
+_BLOCK_HEADER = struct.Struct(">IIII")
+
+# (prefix, prefix length, value bits) for delta-of-delta ranges
+_DOD_BUCKETS = (
+    (0b10, 2, 7),
+    (0b110, 3, 9),
+    (0b1110, 4, 12),
+)
+_DOD_LARGE = (0b1111, 4, 32)
+
+
+class BitWriter:
+    __slots__ = ("buffer", "_acc", "_used")
+
+    def __init__(self) -> None:
+        self.buffer = bytearray()
+        self._acc = 0
+        self._used = 0
+
+    def write(self, value: int, bits: int) -> None:
+        self._acc = (self._acc << bits) | (value & ((1 << bits) - 1))
+        self._used += bits
+        while self._used >= 8:
+            self._used -= 8
+            self.buffer.append((self._acc >> self._used) & 0xFF)
+        self._acc &= (1 << self._used) - 1
+
+    @property
+    def bit_length(self) -> int:
+        return len(self.buffer) * 8 + self._used
+
+    def getvalue(self) -> bytes:
+        """Return the bits written so far, zero padded to a whole byte."""
+        if not self._used:
+            return bytes(self.buffer)
+        return bytes(self.buffer) + bytes(((self._acc << (8 - self._used)) & 0xFF,))
+
+
+class BitReader:
+    __slots__ = ("_value", "_remaining")
+
+    def __init__(self, data: bytes, bit_length: int) -> None:
+        self._value = int.from_bytes(data, "big") >> (len(data) * 8 - bit_length)
+        self._remaining = bit_length
+
+    def read(self, bits: int) -> int:
+        if bits > self._remaining:
+            raise ValueError("Truncated history block")
+        self._remaining -= bits
+        return (self._value >> self._remaining) & ((1 << bits) - 1)
+
+
+class HistoryBlock:
+    """Samples starting at ``start``, appended to a single bit stream."""
+
+    __slots__ = (
+        "start",
+        "count",
+        "_writer",
+        "_data",
+        "_bit_length",
+        "_last_time",
+        "_last_delta",
+        "_last_words",
+        "_windows",
+    )
+
+    def __init__(self, start: int) -> None:
+        self.start = start
+        self.count = 0
+        self._writer: BitWriter | None = BitWriter()
+        self._data = b""
+        self._bit_length = 0
+        self._last_time = start
+        self._last_delta = 0
+        self._last_words: list[int] = [0] * len(FIELDS)
+        # (leading zeros, meaningful bits) last used for each field
+        self._windows: list[tuple[int, int]] = [(0, 0)] * len(FIELDS)
+
+    @property
+    def end(self) -> int:
+        return self._last_time
+
+    @property
+    def sealed(self) -> bool:
+        return self._writer is None
+
+    @property
+    def size(self) -> int:
+        """Return the compressed size in bytes."""
+        if self._writer is not None:
+            return (self._writer.bit_length + 7) // 8
+        return len(self._data)
+
+    def append(self, timestamp: int, words: Sequence[int]) -> None:
+        writer = self._writer
+        assert writer is not None, "block is sealed"
+        if self.count == 0:
+            for word in words:
+                writer.write(word, WORD_BITS)
+        else:
+            delta = timestamp - self._last_time
+            self._write_dod(writer, delta - self._last_delta)
+            self._last_delta = delta
+            for index, word in enumerate(words):
+                self._write_xor(writer, index, word ^ self._last_words[index])
+        self._last_time = timestamp
+        self._last_words = list(words)
+        self.count += 1
+
+    @staticmethod
+    def _write_dod(writer: BitWriter, dod: int) -> None:
+        if dod == 0:
+            writer.write(0, 1)
+            return
+        for prefix, prefix_bits, bits in _DOD_BUCKETS:
+            if -(1 << (bits - 1)) < dod <= 1 << (bits - 1):
+                writer.write(prefix, prefix_bits)
+                writer.write(dod - 1 if dod > 0 else dod, bits)
+                return
+        prefix, prefix_bits, bits = _DOD_LARGE
+        writer.write(prefix, prefix_bits)
+        writer.write(dod, bits)
+
+    def _write_xor(self, writer: BitWriter, index: int, xor: int) -> None:
+        if xor == 0:
+            writer.write(0, 1)
+            return
+        leading = WORD_BITS - xor.bit_length()
+        trailing = (xor & -xor).bit_length() - 1
+        last_leading, last_length = self._windows[index]
+        if (
+            last_length
+            and leading >= last_leading
+            and WORD_BITS - trailing <= last_leading + last_length
+        ):
+            # Fits in the previous window
+            writer.write(0b10, 2)
+            shift = WORD_BITS - last_leading - last_length
+            writer.write(xor >> shift, last_length)
+            return
+        length = WORD_BITS - leading - trailing
+        self._windows[index] = (leading, length)
+        writer.write(0b11, 2)
+        writer.write(leading, 4)
+        writer.write(length - 1, 4)
+        writer.write(xor >> trailing, length)
+
+    def seal(self) -> None:
+        """Freeze the block; it no longer accepts samples."""
+        if self._writer is not None:
+            self._bit_length = self._writer.bit_length
+            self._data = self._writer.getvalue()
+            self._writer = None
+
+    def to_bytes(self) -> bytes:
+        if self._writer is not None:
+            bit_length, data = self._writer.bit_length, self._writer.getvalue()
+        else:
+            bit_length, data = self._bit_length, self._data
+        return _BLOCK_HEADER.pack(self.start, self.count, bit_length, len(data)) + data
+
+    @classmethod
+    def from_bytes(cls, data: bytes | memoryview, offset: int = 0) -> tuple[HistoryBlock, int]:
+        """Read a sealed block, returning it and the offset after it."""
+        start, count, bit_length, size = _BLOCK_HEADER.unpack_from(data, offset)
+        offset += _BLOCK_HEADER.size
+        block = cls(start)
+        block._writer = None
+        block._data = bytes(data[offset : offset + size])
+        block._bit_length = bit_length
+        block.count = count
+        if len(block._data) != size or bit_length > size * 8:
+            raise ValueError("Truncated history file")
+        for timestamp, _ in block:
+            block._last_time = timestamp
+        return block, offset + size
+
+    def __iter__(self) -> Iterator[tuple[int, tuple[int, ...]]]:
+        if self._writer is not None:
+            reader = BitReader(self._writer.getvalue(), self._writer.bit_length)
+        else:
+            reader = BitReader(self._data, self._bit_length)
+        if not self.count:
+            return
+        words = [reader.read(WORD_BITS) for _ in FIELDS]
+        timestamp, delta = self.start, 0
+        yield timestamp, tuple(words)
+        windows = [(0, 0)] * len(FIELDS)
+        for _ in range(self.count - 1):
+            delta += self._read_dod(reader)
+            timestamp += delta
+            for index in range(len(FIELDS)):
+                if not reader.read(1):
+                    continue
+                if reader.read(1):
+                    leading = reader.read(4)
+                    length = reader.read(4) + 1
+                    windows[index] = (leading, length)
+                else:
+                    leading, length = windows[index]
+                words[index] ^= reader.read(length) << (WORD_BITS - leading - length)
+            yield timestamp, tuple(words)
+
+    @staticmethod
+    def _read_dod(reader: BitReader) -> int:
+        if not reader.read(1):
+            return 0
+        for _, _, bits in _DOD_BUCKETS:
+            if not reader.read(1):
+                value = reader.read(bits)
+                if value >= 1 << (bits - 1):
+                    return value - (1 << bits)
+                return value + 1
+        value = reader.read(_DOD_LARGE[2])
+        return value - (1 << 32) if value >= 1 << 31 else value
+
+
+class HistoryStore:
+    """Compressed readings of one device, oldest block first."""
+
+    def __init__(self, retention: float = DEFAULT_RETENTION) -> None:
+        self.retention = retention
+        self.blocks: deque[HistoryBlock] = deque()
+
+    def __len__(self) -> int:
+        return sum(block.count for block in self.blocks)
+
+    @property
+    def size(self) -> int:
+        """Return the compressed size of all blocks in bytes."""
+        return sum(block.size for block in self.blocks)
+
+    def append(self, timestamp: float, words: Sequence[int]) -> bool:
+        """Add the raw words of a reading; older or repeated samples are ignored."""
+        seconds = int(timestamp)
+        blocks = self.blocks
+        if blocks and seconds <= blocks[-1].end:
+            return False
+        if (
+            not blocks
+            or blocks[-1].sealed
+            or seconds - blocks[-1].start >= BLOCK_SPAN
+        ):
+            if blocks:
+                blocks[-1].seal()
+            blocks.append(HistoryBlock(seconds))
+        blocks[-1].append(seconds, words)
+        self.prune(seconds)
+        return True
+
+    def prune(self, now: float) -> None:
+        """Drop blocks that ended before the retention period."""
+        while len(self.blocks) > 1 and self.blocks[0].end < now - self.retention:
+            self.blocks.popleft()
+
+    def query(
+        self, start: float | None = None, end: float | None = None
+    ) -> Iterator[tuple[int, tuple[int, ...]]]:
+        """Yield (timestamp, raw words) between start and end, inclusive."""
+        for block in self.blocks:
+            if end is not None and block.start > end:
+                return
+            if start is not None and block.end < start:
+                continue
+            for timestamp, words in block:
+                if start is not None and timestamp < start:
+                    continue
+                if end is not None and timestamp > end:
+                    return
+                yield timestamp, words
+
+    def readings(
+        self, start: float | None = None, end: float | None = None
+    ) -> Iterator[tuple[int, tuple[float, ...]]]:
+        """Yield (timestamp, scaled values) between start and end."""
+        for timestamp, words in self.query(start, end):
+            yield timestamp, tuple(
+                round(word / scale, 2) if scale != 1 else word
+                for word, scale in zip(words, SCALES)
+            )
+
+    def downsample(
+        self, interval: float, start: float | None = None, end: float | None = None
+    ) -> Iterator[tuple[int, tuple[float, ...]]]:
+        """Yield the mean of each ``interval`` seconds bucket that has samples."""
+        bucket: int | None = None
+        sums = [0.0] * len(FIELDS)
+        count = 0
+        for timestamp, values in self.readings(start, end):
+            current = int(timestamp // interval * interval)
+            if current != bucket:
+                if count:
+                    yield bucket, tuple(round(total / count, 2) for total in sums)
+                bucket, sums, count = current, [0.0] * len(FIELDS), 0
+            for index, value in enumerate(values):
+                sums[index] += value
+            count += 1
+        if count:
+            yield bucket, tuple(round(total / count, 2) for total in sums)
+
+    def to_bytes(self) -> bytes:
+        return _FILE_HEADER.pack(_MAGIC, len(self.blocks)) + b"".join(
+            block.to_bytes() for block in self.blocks
+        )
+
+    @classmethod
+    def from_bytes(
+        cls, data: bytes, retention: float = DEFAULT_RETENTION
+    ) -> HistoryStore:
+        """Load a store written by to_bytes; raises ValueError if it is damaged."""
+        try:
+            magic, count = _FILE_HEADER.unpack_from(data)
+        except struct.error as err:
+            raise ValueError("Truncated history file") from err
+        if magic != _MAGIC:
+            raise ValueError("Not a history file")
+        store = cls(retention)
+        view = memoryview(data)
+        offset = _FILE_HEADER.size
+        try:
+            for _ in range(count):
+                block, offset = HistoryBlock.from_bytes(view, offset)
+                block.seal()
+                store.blocks.append(block)
+        except struct.error as err:
+            raise ValueError("Truncated history file") from err
+        return store
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import bisect
+import logging
+import time
+from collections.abc import Mapping, Sequence
+
+_LOGGER = logging.getLogger(__name__)
+
+# Per-minute change that counts as "moving"
+DEFAULT_RATE_THRESHOLDS: dict[str, float] = {
+    "co2": 5.0,
+    "tvoc": 0.01,
+    "hcho": 0.005,
+}
+
+# Crossing any of these boundaries always tightens the interval
+DEFAULT_BANDS: dict[str, Sequence[float]] = {
+    "co2": (800, 1000, 1500, 2000),
+    "tvoc": (0.3, 0.6, 1.0),
+    "hcho": (0.08, 0.1, 0.3),
+}
+
+DEFAULT_BACKOFF = 1.5
+# Seconds between the first polls, the fixed interval polls used to have
+DEFAULT_START = 300.0
+
+
+class AdaptiveInterval:
+    """Choose the next poll interval from how fast readings are changing."""
+
+    def __init__(
+        self,
+        floor: float,
+        ceiling: float,
+        backoff: float = DEFAULT_BACKOFF,
+        start: float = DEFAULT_START,
+        rate_thresholds: Mapping[str, float] = DEFAULT_RATE_THRESHOLDS,
+        bands: Mapping[str, Sequence[float]] = DEFAULT_BANDS,
+    ) -> None:
+        self.floor = min(floor, ceiling)
+        self.ceiling = ceiling
+        self.backoff = backoff
+        self.rate_thresholds = rate_thresholds
+        self.bands = bands
+        # Start from a moderate rate and only tighten on evidence, so a
+        # restart does not put every device on the shortest interval
+        self.interval: float = min(max(start, self.floor), self.ceiling)
+        self._last: dict[str, float] = {}
+        self._last_time: float | None = None
+
+    def _is_moving(self, reading: Mapping[str, float | None], minutes: float) -> bool:
+        for key, value in reading.items():
+            previous = self._last.get(key)
+            if value is None or previous is None:
+                continue
+            threshold = self.rate_thresholds.get(key)
+            if threshold is not None and abs(value - previous) / minutes > threshold:
+                return True
+            bands = self.bands.get(key)
+            if bands and bisect.bisect(bands, value) != bisect.bisect(bands, previous):
+                return True
+        return False
+
+    def update(
+        self, reading: Mapping[str, float | None], now: float | None = None
+    ) -> float:
+        """Record a reading and return the interval in seconds until the next one."""
+        now = time.monotonic() if now is None else now
+        if self._last_time is not None:
+            minutes = max(now - self._last_time, 1.0) / 60
+            if self._is_moving(reading, minutes):
+                self.interval = self.floor
+            else:
+                self.interval = min(self.interval * self.backoff, self.ceiling)
+        self._last = {k: v for k, v in reading.items() if v is not None}
+        self._last_time = now
+        _LOGGER.debug("Next poll in %.0fs", self.interval)
+        return self.interval
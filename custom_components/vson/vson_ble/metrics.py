@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import bisect
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+# Upper bounds in seconds; anything slower lands in a final overflow bucket
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0, 20.0, 30.0, 60.0)
+
+# Phases of a poll, in the order they happen
+PHASES = (
+    "slot",
+    "connect",
+    "services",
+    "subscribe",
+    "write",
+    "notify",
+    "unsubscribe",
+    "disconnect",
+    "total",
+)
+PERCENTILES = (50, 95, 99)
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations in seconds."""
+
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the upper bound of the bucket holding the percentile."""
+        if not self.count:
+            return None
+        rank = self.count * percent / 100
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                if index < len(BUCKETS):
+                    return round(min(BUCKETS[index], self.max), 3)
+                break
+        return round(self.max, 3)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": round(self.sum / self.count, 3) if self.count else None,
+            "max": round(self.max, 3),
+            **{f"p{percent}": self.percentile(percent) for percent in PERCENTILES},
+            "buckets": dict(
+                zip([*map(str, BUCKETS), "inf"], self.counts, strict=True)
+            ),
+        }
+
+
+class PollMetrics:
+    """Per-phase latency histograms and outcome counters of one device."""
+
+    def __init__(self) -> None:
+        self.phases: dict[str, LatencyHistogram] = {
+            phase: LatencyHistogram() for phase in PHASES
+        }
+        self.successes = 0
+        self.failures = 0
+        self.last_error: str | None = None
+        # Duration of each phase of the latest poll
+        self.last: dict[str, float] = {}
+
+    def observe(self, phase: str, seconds: float) -> None:
+        self.phases[phase].observe(seconds)
+        self.last[phase] = round(seconds, 3)
+
+    @contextmanager
+    def phase(self, phase: str) -> Iterator[None]:
+        """Time the body of the with statement, whether it raises or not."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(phase, time.monotonic() - start)
+
+    def record_success(self) -> None:
+        self.successes += 1
+
+    def record_failure(self, error: BaseException | str) -> None:
+        self.failures += 1
+        self.last_error = str(error) or type(error).__name__
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "successes": self.successes,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "last": dict(self.last),
+            "phases": {
+                phase: histogram.as_dict()
+                for phase, histogram in self.phases.items()
+                if histogram.count
+            },
+        }
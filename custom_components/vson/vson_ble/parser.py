@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+import time
+from collections.abc import Mapping
+from typing import TYPE_CHECKING
 from bleak.backends.device import BLEDevice
 from bluetooth_sensor_state_data import BluetoothData
-from cryptography.hazmat.primitives.ciphers.aead import AESCCM
 from home_assistant_bluetooth import BluetoothServiceInfoBleak
 from sensor_state_data import (
     SensorLibrary,
@@ -15,8 +16,22 @@ from sensor_state_data import (
 from sensor_state_data.description import (
     BaseSensorDescription,
 )
-from .const import SERVICE_WP6003, TIMEOUT_1DAY, TIMEOUT_5MIN
-from .writer import get_sensor_data
+from .breaker import CircuitBreaker
+from .deadline import DEFAULT_DEADLINE, Deadline
+from .decoder import FrameError, decode_frame
+from .history import HistoryStore
+from .metrics import PERCENTILES, PollMetrics
+from .stats import ReadingStatistics
+from .const import (
+    SERVICE_WP6003,
+    TIMEOUT_1DAY,
+    TIMEOUT_5MIN,
+    ExtendedSensorDeviceClass,
+)
+from .writer import Connector, VsonSession, connect_device, get_sensor_data
+
+if TYPE_CHECKING:
+    from .capture import CaptureLog
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,10 +47,33 @@ HCHO__CONCENTRATION_MICROGRAMS_PER_CUBIC_METER = BaseSensorDescription(
     device_class=SensorDeviceClass.FORMALDEHYDE,
     native_unit_of_measurement=Units.CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
 )
+
+# Reading field -> description and name of the sensors derived from it
+STATISTIC_SENSORS = {
+    "temperature": (SensorLibrary.TEMPERATURE__CELSIUS, "Temperature"),
+    "tvoc": (TVOC__CONCENTRATION_MICROGRAMS_PER_CUBIC_METER, "Volatile Organic Compounds"),
+    "hcho": (HCHO__CONCENTRATION_MICROGRAMS_PER_CUBIC_METER, "Formaldehyde"),
+    "co2": (SensorLibrary.CO2__CONCENTRATION_PARTS_PER_MILLION, "Carbon Dioxide"),
+}
+STATISTIC_NAMES = {
+    "mean": "mean",
+    "min": "minimum",
+    "max": "maximum",
+    "average": "time-weighted average",
+}
+
+
 class VsonBluetoothDeviceData(BluetoothData):
     """Data for BTHome Bluetooth devices."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        persistent: bool = False,
+        windows: Mapping[str, float] | None = None,
+        history: HistoryStore | None = None,
+        connect: Connector = connect_device,
+        deadline: float = DEFAULT_DEADLINE,
+    ) -> None:
         super().__init__()
 
         # The last service_info we saw that had a payload
@@ -45,6 +83,40 @@ class VsonBluetoothDeviceData(BluetoothData):
 
         self.pending = True
 
+        # Values decoded by the last successful poll, with the raw frame
+        # and when it was received
+        self.last_reading: dict[str, float] | None = None
+        self.last_frame: bytes | None = None
+        self.last_frame_time: float | None = None
+
+        # Timing and outcome of polls
+        self.metrics = PollMetrics()
+
+        # Stops polls of a device that keeps failing, see CircuitBreaker
+        self.breaker = CircuitBreaker()
+
+        # Opens connections; a simulated peripheral can stand in for bleak
+        self.connect = connect
+
+        # Seconds one poll may hold a connection, see Deadline
+        self.deadline = deadline
+
+        # Opt-in long-lived connection reused across polls
+        self.session: VsonSession | None = (
+            VsonSession(self.metrics, connect) if persistent else None
+        )
+
+        # Rolling statistics per reading field, windows in seconds
+        self.statistics = ReadingStatistics(windows or {})
+
+        # Compressed long-term history of the raw readings
+        self.history = HistoryStore() if history is None else history
+
+        # Opt-in recorder of every advertisement and frame, for replay
+        self.capture: CaptureLog | None = None
+
+        # Address the title and device info were set for
+        self._identity: str | None = None
 
     def supported(self, data: BluetoothServiceInfoBleak) -> bool:
         if not super().supported(data):
@@ -54,44 +126,148 @@ class VsonBluetoothDeviceData(BluetoothData):
     def _start_update(self, service_info: BluetoothServiceInfoBleak) -> None:
         """Update from BLE advertisement data."""
         #_LOGGER.debug(f"service_info: {service_info}")
-        for uuid in service_info.service_uuids:
-            if uuid == SERVICE_WP6003:
-                if self._parse_wp6003(service_info):
-                    self.last_service_info = service_info
+        if self.capture is not None:
+            self.capture.record_advert(service_info)
+        if SERVICE_WP6003 in service_info.service_uuids:
+            if self._parse_wp6003(service_info):
+                self.last_service_info = service_info
         return None
 
     def _parse_wp6003(
         self, service_info: BluetoothServiceInfoBleak
     ) -> bool:
         """Parser for Vson sensors"""
+        if service_info.address != self._identity:
+            self._set_identity(service_info.address)
+        return True
 
+    def _set_identity(self, address: str) -> None:
         model = "WP6003"
         manufacturer = "Vson Technology CO., LTD"
 
-        identifier = service_info.address.replace(":", "")[-4:]
+        identifier = address.replace(":", "")[-4:]
         self.set_title(f"{model} {identifier}")
         self.set_device_name(f"{model} {identifier}")
         self.set_device_type(f"Air Quality Monitor")
         self.set_device_manufacturer(manufacturer)
         self.pending = False
-        return True
+        self._identity = address
+
+    def known_update(self, address: str) -> SensorUpdate:
+        """Describe the sensors of the device before any reading arrived."""
+        self._set_identity(address)
+        for description in (
+            SensorLibrary.TEMPERATURE__CELSIUS,
+            TVOC__CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
+            HCHO__CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
+            SensorLibrary.CO2__CONCENTRATION_PARTS_PER_MILLION,
+        ):
+            self.update_predefined_sensor(description, None)
+        self._update_statistics()
+        self._update_metrics()
+        return self._finish_update()
     
     async def async_poll(self, ble_device: BLEDevice) -> SensorUpdate:
         """
         Poll the device to retrieve any values we can't get from passive listening.
         """
+        try:
+            with self.metrics.phase("total"):
+                deadline = Deadline(self.deadline)
+                if self.session is not None:
+                    data = await self.session.request_data(ble_device, deadline)
+                else:
+                    data = await get_sensor_data(
+                        ble_device, self.metrics, self.connect, deadline
+                    )
+            if data is not None and self.capture is not None:
+                self.capture.record_frame(data)
+            if data is None:
+                raise FrameError("No data received")
+            decode_frame(data)
+        except Exception as err:
+            self.metrics.record_failure(err)
+            self.breaker.record_failure()
+            raise
+        self.metrics.record_success()
+        self.breaker.record_success()
+        self._update_metrics()
+        return self.update_from_frame(data)
+
+    def metrics_update(self) -> SensorUpdate:
+        """Return an update carrying only the poll metrics, e.g. after a failure."""
+        self._update_metrics()
+        return self._finish_update()
+
+    def update_from_frame(
+        self, data: bytes, timestamp: float | None = None
+    ) -> SensorUpdate:
+        """Update from a notification frame, polled, streamed or cached."""
         self._events_updates.clear()
-        data = await get_sensor_data(ble_device)
         #0a0001010e02010908000065000f01000251
-        if len(data) == 18:
-            temperature = ((data[6] << 8) + data[7]) / 10
-            tvoc = ((data[10] << 8) + data[11]) / 1000
-            hcho = ((data[12] << 8) + data[13]) / 1000
-            co2 = ((data[16] << 8) + data[17])
-            
-            self.update_predefined_sensor(SensorLibrary.TEMPERATURE__CELSIUS, round(temperature, 2))
-            self.update_predefined_sensor(TVOC__CONCENTRATION_MICROGRAMS_PER_CUBIC_METER, round(tvoc, 2))
-            self.update_predefined_sensor(HCHO__CONCENTRATION_MICROGRAMS_PER_CUBIC_METER, round(hcho, 2))
-            self.update_predefined_sensor(SensorLibrary.CO2__CONCENTRATION_PARTS_PER_MILLION, co2)
+        try:
+            frame = decode_frame(data)
+        except FrameError as err:
+            _LOGGER.debug("Ignoring frame: %s", err)
+        else:
+            self.last_reading = frame.as_dict()
+            self.last_frame = bytes(data)
+            self.last_frame_time = time.time() if timestamp is None else timestamp
+            self.update_predefined_sensor(SensorLibrary.TEMPERATURE__CELSIUS, frame.temperature)
+            self.update_predefined_sensor(TVOC__CONCENTRATION_MICROGRAMS_PER_CUBIC_METER, frame.tvoc)
+            self.update_predefined_sensor(HCHO__CONCENTRATION_MICROGRAMS_PER_CUBIC_METER, frame.hcho)
+            self.update_predefined_sensor(SensorLibrary.CO2__CONCENTRATION_PARTS_PER_MILLION, frame.co2)
+            self.statistics.add(self.last_reading, self.last_frame_time)
+            self.history.append(self.last_frame_time, frame.raw)
+            self._update_statistics()
 
         return self._finish_update()
+
+    def _update_statistics(self) -> None:
+        """Report the rolling statistics as sensors of their own."""
+        for field, window in self.statistics.windows.items():
+            description, label = STATISTIC_SENSORS[field]
+            minutes = round(window.window / 60)
+            for statistic, value in window.as_dict().items():
+                self.update_sensor(
+                    key=f"{description.device_class}_{statistic}",
+                    native_unit_of_measurement=description.native_unit_of_measurement,
+                    native_value=None if value is None else round(value, 2),
+                    device_class=description.device_class,
+                    name=f"{label} {minutes} min {STATISTIC_NAMES[statistic]}",
+                )
+
+    def _update_metrics(self) -> None:
+        """Report poll latency percentiles, outcome counters and breaker state as sensors."""
+        total = self.metrics.phases["total"]
+        for percent in PERCENTILES:
+            self.update_sensor(
+                key=f"poll_duration_p{percent}",
+                native_unit_of_measurement=Units.TIME_SECONDS,
+                native_value=total.percentile(percent),
+                device_class=SensorDeviceClass.DURATION,
+                name=f"Poll duration p{percent}",
+            )
+        for key, value in (
+            ("poll_successes", self.metrics.successes),
+            ("poll_failures", self.metrics.failures),
+        ):
+            self.update_sensor(
+                key=key,
+                native_unit_of_measurement=None,
+                native_value=value,
+                device_class=SensorDeviceClass.COUNT,
+                name=key.replace("_", " ").capitalize(),
+            )
+        self.update_sensor(
+            key="connection_state",
+            native_unit_of_measurement=None,
+            native_value=self.breaker.state,
+            device_class=ExtendedSensorDeviceClass.ENUM,
+            name="Connection state",
+        )
+
+    async def async_close(self) -> None:
+        """Release the persistent connection, if any."""
+        if self.session is not None:
+            await self.session.close()
@@ -0,0 +1,264 @@
+"""Simulated WP6003 peripheral for running the poll path without hardware.
+
+SimulatedWp6003 stands in for the device and its connect method for
+connect_device, so it can be passed as ``connect`` to get_sensor_data,
+VsonSession or VsonBluetoothDeviceData::
+
+    device = SimulatedWp6003(faults=Faults(drop_rate=0.1), seed=1)
+    data = VsonBluetoothDeviceData(connect=device.connect)
+    await data.async_poll(device.ble_device)
+
+Each connection is a SimulatedClient with the fff0 service and its fff1
+command and fff4 notify characteristics. A 0xAB write is answered with the
+next frame as a notification. Frames come from the ``frames`` given, or
+from a random walk of realistic readings.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from bleak import BleakClient, BleakError
+from bleak.backends.device import BLEDevice
+
+from .const import CHAR_CMD, CHAR_NOTI, SERVICE_WP6003
+from .decoder import encode_frame
+
+NotifyCallback = Callable[[Any, bytearray], None]
+
+
+@dataclass
+class Faults:
+    """Latencies in seconds and fault probabilities of a simulated device."""
+
+    # Time to establish a connection
+    connect_latency: float = 0.0
+    # One GATT request and its response, e.g. a connection interval
+    round_trip: float = 0.0
+    # Time the device takes to answer a reading request
+    notify_delay: float = 0.0
+    # Time a disconnect takes, e.g. a proxy that hangs
+    disconnect_latency: float = 0.0
+    # Chance a connection attempt fails
+    connect_failure_rate: float = 0.0
+    # Chance a reading request is never answered
+    drop_rate: float = 0.0
+    # Chance the link drops while writing a request
+    disconnect_rate: float = 0.0
+    # Connections report a stale service table without fff0 until
+    # clear_cache is called
+    missing_services: bool = False
+
+
+@dataclass
+class SimulatorStats:
+    """What happened to a simulated device, for assertions and reports."""
+
+    connections: int = 0
+    connect_failures: int = 0
+    requests: int = 0
+    notifications: int = 0
+    dropped: int = 0
+    disconnects: int = 0
+    cache_clears: int = 0
+
+
+@dataclass(frozen=True)
+class SimulatedCharacteristic:
+    uuid: str
+    properties: list[str]
+
+
+@dataclass(frozen=True)
+class SimulatedService:
+    uuid: str
+    characteristics: list[SimulatedCharacteristic] = field(default_factory=list)
+
+
+class SimulatedServices:
+    """The parts of BleakGATTServiceCollection the integration uses."""
+
+    def __init__(self, services: Iterable[SimulatedService]) -> None:
+        self.services = {service.uuid: service for service in services}
+        self.characteristics = {
+            char.uuid: char
+            for service in self.services.values()
+            for char in service.characteristics
+        }
+
+    def __iter__(self) -> Iterator[SimulatedService]:
+        return iter(self.services.values())
+
+    def get_characteristic(self, uuid: str) -> SimulatedCharacteristic | None:
+        return self.characteristics.get(uuid)
+
+
+WP6003_SERVICES = (
+    SimulatedService(
+        SERVICE_WP6003,
+        [
+            SimulatedCharacteristic(CHAR_CMD, ["write", "write-without-response"]),
+            SimulatedCharacteristic(CHAR_NOTI, ["notify"]),
+        ],
+    ),
+)
+
+
+def random_frames(seed: int | None = None) -> Iterator[bytes]:
+    """Yield frames of an occupied room: CO2 and VOCs drift, temperature wobbles."""
+    rng = random.Random(seed)
+    temperature, tvoc, hcho, co2 = 22.0, 0.1, 0.02, 600.0
+    while True:
+        temperature = min(35.0, max(15.0, temperature + rng.gauss(0, 0.1)))
+        tvoc = min(2.0, max(0.0, tvoc + rng.gauss(0, 0.01)))
+        hcho = min(0.5, max(0.0, hcho + rng.gauss(0, 0.002)))
+        co2 = min(3000.0, max(400.0, co2 + rng.gauss(0, 15)))
+        yield encode_frame(temperature, tvoc, hcho, round(co2))
+
+
+class SimulatedWp6003:
+    """A WP6003 that accepts connections from SimulatedClient."""
+
+    def __init__(
+        self,
+        address: str = "AA:BB:CC:DD:EE:FF",
+        frames: Iterable[bytes] | None = None,
+        faults: Faults | None = None,
+        seed: int | None = None,
+    ) -> None:
+        self.address = address
+        self.ble_device = BLEDevice(address, "WP6003", None)
+        self.faults = faults or Faults()
+        self.rng = random.Random(seed)
+        self.frames = iter(random_frames(seed) if frames is None else frames)
+        self.stale_services = self.faults.missing_services
+        self.stats = SimulatorStats()
+
+    def next_frame(self) -> bytes:
+        return next(self.frames)
+
+    async def connect(
+        self,
+        ble_device: BLEDevice,
+        disconnected_callback: Callable[[BleakClient], None] | None = None,
+    ) -> SimulatedClient:
+        """Connect the way connect_device does."""
+        if self.faults.connect_latency:
+            await asyncio.sleep(self.faults.connect_latency)
+        if self.rng.random() < self.faults.connect_failure_rate:
+            self.stats.connect_failures += 1
+            raise BleakError(f"{self.address}: simulated connection failure")
+        self.stats.connections += 1
+        return SimulatedClient(self, disconnected_callback)
+
+
+class SimulatedClient:
+    """Just enough of a BleakClientWithServiceCache for VsonClient."""
+
+    def __init__(
+        self,
+        device: SimulatedWp6003,
+        disconnected_callback: Callable[[BleakClient], None] | None = None,
+    ) -> None:
+        self.device = device
+        self.address = device.address
+        self.services = SimulatedServices(
+            () if device.stale_services else WP6003_SERVICES
+        )
+        self.is_connected = True
+        self._disconnected_callback = disconnected_callback
+        self._callback: NotifyCallback | None = None
+        # Notifications on their way, oldest first
+        self._pending: deque[asyncio.TimerHandle] = deque()
+
+    async def _round_trip(self) -> None:
+        if not self.is_connected:
+            raise BleakError(f"{self.address}: not connected")
+        if self.device.faults.round_trip:
+            await asyncio.sleep(self.device.faults.round_trip)
+        if not self.is_connected:
+            raise BleakError(f"{self.address}: disconnected")
+
+    def _char(self, char: SimulatedCharacteristic | str) -> SimulatedCharacteristic:
+        uuid = char if isinstance(char, str) else char.uuid
+        if (found := self.services.get_characteristic(uuid)) is None:
+            raise BleakError(f"Characteristic {uuid} was not found")
+        return found
+
+    async def start_notify(
+        self, char: SimulatedCharacteristic | str, callback: NotifyCallback
+    ) -> None:
+        char = self._char(char)
+        if "notify" not in char.properties:
+            raise BleakError(f"Characteristic {char.uuid} does not notify")
+        await self._round_trip()
+        self._callback = callback
+
+    async def stop_notify(self, char: SimulatedCharacteristic | str) -> None:
+        self._char(char)
+        await self._round_trip()
+        self._callback = None
+
+    async def write_gatt_char(
+        self,
+        char: SimulatedCharacteristic | str,
+        data: bytes | bytearray,
+        response: bool | None = None,
+    ) -> None:
+        char = self._char(char)
+        device = self.device
+        if response or "write-without-response" not in char.properties:
+            await self._round_trip()
+        elif not self.is_connected:
+            raise BleakError(f"{self.address}: not connected")
+        if device.rng.random() < device.faults.disconnect_rate:
+            self._lost()
+            raise BleakError(f"{self.address}: simulated disconnect")
+        if char.uuid != CHAR_CMD or bytes(data[:1]) != b"\xab":
+            return
+        device.stats.requests += 1
+        if device.rng.random() < device.faults.drop_rate:
+            device.stats.dropped += 1
+            return
+        frame = bytearray(device.next_frame())
+        self._pending.append(
+            asyncio.get_running_loop().call_later(
+                device.faults.notify_delay, self._notify, frame
+            )
+        )
+
+    def _notify(self, frame: bytearray) -> None:
+        self._pending.popleft()
+        if self.is_connected and self._callback is not None:
+            self.device.stats.notifications += 1
+            self._callback(self._char(CHAR_NOTI), frame)
+
+    async def clear_cache(self) -> bool:
+        self.device.stale_services = False
+        self.device.stats.cache_clears += 1
+        return True
+
+    def _lost(self) -> None:
+        if not self.is_connected:
+            return
+        self.is_connected = False
+        self._callback = None
+        for handle in self._pending:
+            handle.cancel()
+        self._pending.clear()
+        self.device.stats.disconnects += 1
+        if self._disconnected_callback is not None:
+            self._disconnected_callback(self)  # type: ignore[arg-type]
+
+    async def disconnect(self) -> bool:
+        if self.is_connected and self.device.faults.round_trip:
+            await asyncio.sleep(self.device.faults.round_trip)
+        if self.device.faults.disconnect_latency:
+            await asyncio.sleep(self.device.faults.disconnect_latency)
+        self._lost()
+        return True
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Mapping
+
+STATISTICS = ("mean", "min", "max", "average")
+
+
+class RollingWindow:
+    """Statistics over the samples of the last ``window`` seconds.
+
+    Each sample costs O(1) amortised: running sums give the mean and the time
+    weighted average, monotonic deques give the minimum and maximum. The time
+    weighted average holds every value until the next sample, which is what
+    irregular (adaptive) poll intervals need.
+    """
+
+    __slots__ = ("window", "_samples", "_min", "_max", "_sum", "_area", "_before")
+
+    def __init__(self, window: float) -> None:
+        self.window = window
+        self._samples: deque[tuple[float, float]] = deque()
+        self._min: deque[tuple[float, float]] = deque()
+        self._max: deque[tuple[float, float]] = deque()
+        self._sum = 0.0
+        # Sum of value * duration between consecutive samples in the window
+        self._area = 0.0
+        # Value of the last sample that left the window, held up to its start
+        self._before: float | None = None
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, value: float, timestamp: float) -> None:
+        """Add a sample; timestamps must not go backwards."""
+        samples = self._samples
+        if samples:
+            last_time, last_value = samples[-1]
+            if timestamp < last_time:
+                return
+            self._area += last_value * (timestamp - last_time)
+        samples.append((timestamp, value))
+        self._sum += value
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((timestamp, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((timestamp, value))
+        self._evict(timestamp - self.window)
+
+    def _evict(self, start: float) -> None:
+        samples = self._samples
+        # Always keep the newest sample
+        while len(samples) > 1 and samples[0][0] < start:
+            first_time, first_value = samples.popleft()
+            self._sum -= first_value
+            self._area -= first_value * (samples[0][0] - first_time)
+            self._before = first_value
+        while self._min[0][0] < samples[0][0]:
+            self._min.popleft()
+        while self._max[0][0] < samples[0][0]:
+            self._max.popleft()
+
+    @property
+    def mean(self) -> float | None:
+        if not self._samples:
+            return None
+        return self._sum / len(self._samples)
+
+    @property
+    def minimum(self) -> float | None:
+        return self._min[0][1] if self._min else None
+
+    @property
+    def maximum(self) -> float | None:
+        return self._max[0][1] if self._max else None
+
+    @property
+    def average(self) -> float | None:
+        """Return the time weighted average up to the newest sample."""
+        if not self._samples:
+            return None
+        first_time = self._samples[0][0]
+        last_time, last_value = self._samples[-1]
+        area = self._area
+        start = last_time - self.window
+        if self._before is not None and start < first_time:
+            area += self._before * (first_time - start)
+        else:
+            start = first_time
+        if last_time <= start:
+            return last_value
+        return area / (last_time - start)
+
+    def as_dict(self) -> dict[str, float | None]:
+        return {
+            "mean": self.mean,
+            "min": self.minimum,
+            "max": self.maximum,
+            "average": self.average,
+        }
+
+
+class ReadingStatistics:
+    """Rolling windows for the fields of a reading."""
+
+    def __init__(self, windows: Mapping[str, float]) -> None:
+        """Windows are in seconds; fields with a window of 0 are skipped."""
+        self.windows = {
+            field: RollingWindow(window)
+            for field, window in windows.items()
+            if window > 0
+        }
+
+    def add(self, reading: Mapping[str, float | None], timestamp: float) -> None:
+        for field, window in self.windows.items():
+            if (value := reading.get(field)) is not None:
+                window.add(value, timestamp)
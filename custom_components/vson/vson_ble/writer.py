@@ -1,17 +1,37 @@
 # vson_ble.py
 
 from __future__ import annotations
-from enum import Enum
 import logging
-import struct
-import traceback
-from typing import Any, Callable, TypeVar
-from asyncio import Event, wait_for, sleep
-from PIL import Image
+from contextlib import AbstractAsyncContextManager, nullcontext
+from typing import Any, AsyncIterator, Awaitable, Callable, TypeVar
+from asyncio import (
+    FIRST_COMPLETED,
+    Event,
+    Lock,
+    Queue,
+    QueueFull,
+    Task,
+    create_task,
+    shield,
+    timeout,
+    wait,
+    wait_for,
+    sleep,
+)
 from bleak import BleakClient, BleakError
+from bleak.backends.characteristic import BleakGATTCharacteristic
 from bleak.backends.device import BLEDevice
-from bleak_retry_connector import establish_connection
-from .const import SERVICE_WP6003, CHAR_CMD, CHAR_NOTI
+from bleak_retry_connector import BleakClientWithServiceCache, establish_connection
+from .const import (
+    SERVICE_WP6003,
+    CHAR_CMD,
+    CHAR_NOTI,
+    DISCONNECT_TIMEOUT,
+    READ_TIMEOUT,
+    STREAM_QUEUE_SIZE,
+)
+from .deadline import DEFAULT_DEADLINE, Deadline
+from .metrics import PollMetrics
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,67 +51,230 @@ def disconnect_on_missing_services(func: WrapFuncType) -> WrapFuncType:
             return await func(self, *args, **kwargs)
         except (BleakServiceMissing, BleakCharacteristicMissing):
             if self.client.is_connected:
+                # The cached service table is stale, discover again next time
+                _LOGGER.debug("Clearing service cache of %s", self.client.address)
                 await self.client.clear_cache()
                 await self.client.disconnect()
             raise
     return wrapper  # type: ignore
 
+async def connect_device(
+    ble_device: BLEDevice,
+    disconnected_callback: Callable[[BleakClient], None] | None = None,
+) -> BleakClientWithServiceCache:
+    """Connect to a device through bleak_retry_connector."""
+    # Services come from the adapter's or proxy's cache, which survives
+    # restarts; discovery only runs when it is empty
+    return await establish_connection(
+        BleakClientWithServiceCache,
+        ble_device,
+        ble_device.address,
+        disconnected_callback=disconnected_callback,
+        use_services_cache=True,
+    )
+
+# Opens a connection, e.g. connect_device or a simulated peripheral
+Connector = Callable[..., Awaitable[BleakClientWithServiceCache]]
+
+async def disconnect_client(
+    client: BleakClient | None, metrics: PollMetrics
+) -> None:
+    """Disconnect, even when the transaction was cancelled or timed out.
+
+    A disconnect that hangs, e.g. on a stuck proxy, is given up after
+    DISCONNECT_TIMEOUT so the caller's connection slot is freed.
+    """
+    if client and client.is_connected:
+        with metrics.phase("disconnect"):
+            try:
+                async with timeout(DISCONNECT_TIMEOUT):
+                    # A second cancellation must not leave the link up
+                    await shield(client.disconnect())
+            except TimeoutError:
+                _LOGGER.warning(
+                    "%s: disconnect did not finish within %.0fs",
+                    client.address,
+                    DISCONNECT_TIMEOUT,
+                )
+
 async def get_sensor_data(
     ble_device: BLEDevice,
+    metrics: PollMetrics | None = None,
+    connect: Connector = connect_device,
+    deadline: Deadline | None = None,
 ) -> bytes:
-    client: BleakClient | None = None
+    metrics = metrics or PollMetrics()
+    deadline = deadline or Deadline(DEFAULT_DEADLINE)
+    client: BleakClientWithServiceCache | None = None
     try:
         _LOGGER.debug("connection: %s", ble_device)
-        client = await establish_connection(BleakClient, ble_device, ble_device.address)
-        services = client.services
-        for svc in services:
-            for c in svc.characteristics:
-                _LOGGER.debug(f"uuid: {svc.uuid}, char: {c}")
+        with metrics.phase("connect"):
+            async with deadline.phase("connect"):
+                client = await connect(ble_device)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            with metrics.phase("services"):
+                for svc in client.services:
+                    for c in svc.characteristics:
+                        _LOGGER.debug(f"uuid: {svc.uuid}, char: {c}")
 
-        vson = VsonClient(client)
+        vson = VsonClient(client, metrics, deadline)
         return await vson.request_data()
-    except Exception as e:
-        _LOGGER.error(f"Fail get data: {e}")
-        _LOGGER.error(traceback.print_exc())
     finally:
-        if client and client.is_connected:
-            await client.disconnect()
-    return None
+        # Errors go to the caller, which records and reports them once
+        await disconnect_client(client, metrics)
+
+class VsonSession:
+    """Keep one connection and notification subscription open for a device."""
+
+    def __init__(
+        self,
+        metrics: PollMetrics | None = None,
+        connect: Connector = connect_device,
+    ) -> None:
+        self.client: BleakClientWithServiceCache | None = None
+        self.vson: VsonClient | None = None
+        self.lock: Lock = Lock()
+        self.metrics = metrics or PollMetrics()
+        self.connect = connect
+
+    @property
+    def is_connected(self) -> bool:
+        return self.client is not None and self.client.is_connected
+
+    def _on_disconnect(self, client: BleakClient) -> None:
+        _LOGGER.debug("Session disconnected: %s", client.address)
+        if client is self.client:
+            self.client = None
+            self.vson = None
+
+    async def _connect(self, ble_device: BLEDevice, deadline: Deadline) -> VsonClient:
+        if self.vson is not None and self.is_connected:
+            self.vson.deadline = deadline
+            return self.vson
+        _LOGGER.debug("session connection: %s", ble_device)
+        with self.metrics.phase("connect"):
+            async with deadline.phase("connect"):
+                client = await self.connect(ble_device, self._on_disconnect)
+        vson = VsonClient(client, self.metrics, deadline)
+        try:
+            await vson.start_notify()
+        except BaseException:
+            await disconnect_client(client, self.metrics)
+            raise
+        self.client = client
+        self.vson = vson
+        return vson
+
+    async def request_data(
+        self, ble_device: BLEDevice, deadline: Deadline | None = None
+    ) -> bytes:
+        """Request a reading, reconnecting once if the link has dropped.
+
+        Both attempts share the one ``deadline``.
+        """
+        deadline = deadline or Deadline(DEFAULT_DEADLINE)
+        async with self.lock:
+            try:
+                return await self._request(ble_device, deadline)
+            except Exception as e:
+                _LOGGER.debug(f"Session request failed: {e}")
+                await self._disconnect()
+            try:
+                return await self._request(ble_device, deadline)
+            except Exception:
+                await self._disconnect()
+                raise
+
+    async def _request(self, ble_device: BLEDevice, deadline: Deadline) -> bytes:
+        vson = await self._connect(ble_device, deadline)
+        return await vson.write_with_response(CHAR_CMD, bytes([0xAB]))
+
+    async def _disconnect(self) -> None:
+        client = self.client
+        self.client = None
+        self.vson = None
+        await disconnect_client(client, self.metrics)
+
+    async def close(self) -> None:
+        """Drop the connection."""
+        async with self.lock:
+            await self._disconnect()
 
 class VsonClient:
        
     def __init__(
         self,
-        client: BleakClient
+        client: BleakClientWithServiceCache,
+        metrics: PollMetrics | None = None,
+        deadline: Deadline | None = None,
     ) -> None:
         self.client = client
+        self.metrics = metrics or PollMetrics()
+        # Bounds each phase of a request; streaming runs without one
+        self.deadline = deadline
         self.event: Event = Event()
         self.command_data: bytes | None = None
+        # Streaming mode state, see stream()
+        self.queue: Queue[bytes] | None = None
+        self.dropped: int = 0
+        self._room: Event = Event()
+
+    def _characteristic(self, uuid: str) -> BleakGATTCharacteristic:
+        if (char := self.client.services.get_characteristic(uuid)) is None:
+            raise BleakCharacteristicMissing(f"Characteristic {uuid} not found")
+        return char
+
+    def _limit(self, phase: str) -> AbstractAsyncContextManager[None]:
+        if self.deadline is None:
+            return nullcontext()
+        return self.deadline.phase(phase)
 
     @disconnect_on_missing_services
     async def start_notify(self) -> None:
-        await self.client.start_notify(CHAR_NOTI, self._notification_handler)
-        await sleep(0.5)
+        # Returns once the device acknowledged the subscription, so
+        # notifications are flowing without waiting any longer
+        with self.metrics.phase("subscribe"):
+            async with self._limit("subscribe"):
+                await self.client.start_notify(
+                    self._characteristic(CHAR_NOTI), self._notification_handler
+                )
 
     @disconnect_on_missing_services
     async def stop_notify(self) -> None:
-        await self.client.stop_notify(CHAR_NOTI)
+        with self.metrics.phase("unsubscribe"):
+            await self.client.stop_notify(CHAR_NOTI)
 
     @disconnect_on_missing_services
     async def write(self, uuid: str, data: bytes) -> None:
         _LOGGER.debug("Write UUID=%s data=%s", uuid, len(data))
-        chunk = len(data)
-        for i in range(0, len(data), chunk):
-            await self.client.write_gatt_char(uuid, data[i : i + chunk])
-            await sleep(0.05)
+        char = self._characteristic(uuid)
+        # The answer comes back as a notification, so skip the write
+        # response round trip whenever the characteristic allows it
+        response = "write-without-response" not in char.properties
+        with self.metrics.phase("write"):
+            async with self._limit("write"):
+                await self.client.write_gatt_char(char, data, response=response)
 
     def _notification_handler(self, _: Any, data: bytearray) -> None:
         if self.command_data == None:
             self.command_data = bytes(data)
             self.event.set()
+        if self.queue is not None:
+            try:
+                self.queue.put_nowait(bytes(data))
+            except QueueFull:
+                self.dropped += 1
+                _LOGGER.warning(
+                    "Stream queue full, dropped frame (%s so far)", self.dropped
+                )
 
-    async def read(self, timeout: float = 5.0) -> bytes:
-        await wait_for(self.event.wait(), timeout)
+    async def read(self) -> bytes:
+        with self.metrics.phase("notify"):
+            if self.deadline is None:
+                await wait_for(self.event.wait(), READ_TIMEOUT)
+            else:
+                async with self.deadline.phase("read"):
+                    await self.event.wait()
         data = self.command_data or b""
         _LOGGER.debug("Received: %s", data.hex())
         return data
@@ -105,8 +288,59 @@ class VsonClient:
     #0xAB get data
     #0xAD calibration
     async def request_data(self) -> bytes:
+        """Request one reading on a connection that is closed right after.
+
+        There is no stop_notify: the disconnect drops the subscription anyway.
+        """
         await self.start_notify()
-        data = await self.write_with_response(CHAR_CMD, bytes([0xAB]))
-        await self.stop_notify()
-        return data
-    
\ No newline at end of file
+        return await self.write_with_response(CHAR_CMD, bytes([0xAB]))
+    
+
+    async def _request_loop(self, interval: float) -> None:
+        while True:
+            # Back-pressure: only ask for another frame once the consumer
+            # has made room for it
+            while self.queue is not None and self.queue.full():
+                self._room.clear()
+                await self._room.wait()
+            await self.write(CHAR_CMD, bytes([0xAB]))
+            await sleep(interval)
+
+    async def stream(
+        self, interval: float | None = None, maxsize: int = STREAM_QUEUE_SIZE
+    ) -> AsyncIterator[bytes]:
+        """Yield every notification frame until the caller stops iterating.
+
+        With ``interval`` set a reading is requested every ``interval`` seconds
+        while the queue has room, so a slow consumer throttles the device
+        instead of losing frames. Frames the device pushes on its own into a
+        full queue are counted in ``dropped`` and logged.
+        """
+        self.queue = queue = Queue(maxsize)
+        self.dropped = 0
+        await self.start_notify()
+        requester = create_task(self._request_loop(interval)) if interval else None
+        getter: Task[bytes] | None = None
+        try:
+            while True:
+                if requester is None:
+                    frame = await queue.get()
+                else:
+                    getter = create_task(queue.get())
+                    await wait({getter, requester}, return_when=FIRST_COMPLETED)
+                    if not getter.done():
+                        getter.cancel()
+                        # Surface the error that stopped the requests
+                        requester.result()
+                    frame = getter.result()
+                self._room.set()
+                yield frame
+        finally:
+            # The consumer may be cancelled while waiting on both
+            if getter is not None:
+                getter.cancel()
+            if requester is not None:
+                requester.cancel()
+            self.queue = None
+            if self.client.is_connected:
+                await self.stop_notify()
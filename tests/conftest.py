@@ -0,0 +1,64 @@
+"""Fixtures for the Vson Bluetooth tests."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+import time
+
+import pytest
+from bleak.backends.device import BLEDevice
+from homeassistant.components.bluetooth import (
+    BluetoothServiceInfoBleak,
+    async_scanner_by_source,
+)
+from homeassistant.core import HomeAssistant
+
+from custom_components.vson.vson_ble.const import SERVICE_WP6003
+
+pytest_plugins = ["pytest_homeassistant_custom_component"]
+
+ADDRESS = "AA:BB:CC:DD:EE:FF"
+# 26.5 °C, TVOC 0.1 and HCHO 0.01 mg/m³, 593 ppm CO2
+FRAME = bytes.fromhex("0a0001010e02010908000065000f01000251")
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Load the integration from custom_components."""
+    yield
+
+
+@pytest.fixture(name="enable_bluetooth")
+async def enable_bluetooth_fixture(
+    hass: HomeAssistant, enable_bluetooth: None
+) -> AsyncGenerator[None]:
+    """Enable Bluetooth, and cancel its scanner's expiry timer afterwards.
+
+    The bluetooth integration does not cancel that timer when it unloads, so
+    without this every test ends with a lingering timer that is not ours.
+    """
+    scanner = async_scanner_by_source(hass, "00:00:00:00:00:01")
+    yield
+    if scanner is not None:
+        # async_setup restarts the timer and returns what cancels it
+        scanner.async_setup()()
+
+
+def advertisement(
+    rssi: int = -60, name: str = "WP6003", address: str = ADDRESS
+) -> BluetoothServiceInfoBleak:
+    """Return an advertisement of a WP6003."""
+    return BluetoothServiceInfoBleak(
+        name=name,
+        address=address,
+        rssi=rssi,
+        manufacturer_data={},
+        service_data={},
+        service_uuids=[SERVICE_WP6003],
+        source="local",
+        device=BLEDevice(address, "WP6003", None),
+        advertisement=None,
+        connectable=True,
+        time=time.monotonic(),
+        tx_power=None,
+    )
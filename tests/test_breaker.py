@@ -0,0 +1,78 @@
+"""Tests for the per-device circuit breaker."""
+
+from __future__ import annotations
+
+from custom_components.vson.vson_ble.breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+)
+
+
+def _open(breaker: CircuitBreaker, now: float = 0.0) -> None:
+    for _ in range(breaker.threshold):
+        breaker.record_failure(now)
+
+
+def test_opens_after_threshold_failures() -> None:
+    breaker = CircuitBreaker(threshold=3, base_delay=60)
+    breaker.record_failure(0)
+    breaker.record_failure(0)
+    assert breaker.state == CLOSED
+    assert breaker.allow(0)
+
+    breaker.record_failure(0)
+    assert breaker.state == OPEN
+    assert not breaker.allow(59)
+    assert breaker.retry_in(0) == 60
+
+
+def test_success_resets_the_count() -> None:
+    breaker = CircuitBreaker(threshold=3)
+    breaker.record_failure(0)
+    breaker.record_failure(0)
+    breaker.record_success()
+    breaker.record_failure(0)
+    assert breaker.state == CLOSED
+    assert breaker.failures == 1
+
+
+def test_half_open_probe_closes_on_success() -> None:
+    breaker = CircuitBreaker(threshold=3, base_delay=60)
+    _open(breaker)
+    assert breaker.allow(60)
+    assert breaker.state == HALF_OPEN
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.as_dict() == {
+        "state": CLOSED,
+        "failures": 0,
+        "trips": 0,
+        "retry_in": 0.0,
+    }
+
+
+def test_failed_probe_backs_off_up_to_the_cap() -> None:
+    """Every failed probe opens the breaker for twice as long, up to the cap."""
+    breaker = CircuitBreaker(threshold=3, base_delay=60, max_delay=600, factor=2)
+    _open(breaker)
+    now = 0.0
+    delays = []
+    for _ in range(6):
+        delays.append(breaker.retry_in(now))
+        now = breaker.retry_at
+        assert breaker.allow(now)
+        assert breaker.state == HALF_OPEN
+        # A single failed probe opens it again
+        breaker.record_failure(now)
+        assert breaker.state == OPEN
+    assert delays == [60, 120, 240, 480, 600, 600]
+
+
+def test_retry_in_is_zero_unless_open() -> None:
+    breaker = CircuitBreaker()
+    assert breaker.retry_in(0) == 0
+    _open(breaker)
+    assert breaker.retry_in(breaker.retry_at + 1) == 0
@@ -0,0 +1,76 @@
+"""Tests for the capture file."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import struct
+
+from custom_components.vson.vson_ble import VsonBluetoothDeviceData
+from custom_components.vson.vson_ble.capture import (
+    KIND_ADVERT,
+    KIND_FRAME,
+    MAGIC_V1,
+    CaptureLog,
+    iter_records,
+)
+
+from .conftest import ADDRESS, FRAME, advertisement
+
+# How CoreBluetooth on macOS identifies a device
+UUID_ADDRESS = "2B3C8F1E-7D5A-4E2B-9C61-0F8A3D2E5B47"
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    """Advertisements and frames read back as they were recorded."""
+    log = CaptureLog(tmp_path / "capture.bin")
+    log.record_advert(advertisement(rssi=-71, address=UUID_ADDRESS))
+    log.record_frame(FRAME, 1000.0)
+    log.flush()
+
+    advert, frame = iter_records(log.path.read_bytes())
+    assert advert.kind == KIND_ADVERT
+    assert advert.advert.address == UUID_ADDRESS
+    assert advert.advert.rssi == -71
+    assert advert.advert.name == "WP6003"
+    assert frame.kind == KIND_FRAME
+    assert (frame.timestamp, frame.body) == (1000.0, FRAME)
+
+
+def test_long_name_is_cut_on_a_character(tmp_path: Path) -> None:
+    """A name over 255 bytes is shortened without splitting a character."""
+    log = CaptureLog(tmp_path / "capture.bin")
+    log.record_advert(advertisement(name="é" * 200))
+    log.flush()
+
+    (record,) = iter_records(log.path.read_bytes())
+    assert record.advert.name == "é" * 127
+
+
+def test_parser_records_any_address(tmp_path: Path) -> None:
+    """Capturing does not break parsing of a non-MAC address."""
+    data = VsonBluetoothDeviceData()
+    data.capture = CaptureLog(tmp_path / "capture.bin")
+    data.update(advertisement(address=UUID_ADDRESS))
+    assert data.capture.records == 1
+
+
+def test_version_1_is_read_and_set_aside(tmp_path: Path) -> None:
+    """Old files still replay, and new records go to a new file."""
+    path = tmp_path / "capture.bin"
+    body = (
+        struct.pack(">6sbB", bytes.fromhex(ADDRESS.replace(":", "")), -60, 1)
+        + b"\x06WP6003\x05local\x00\x00\x00"
+    )
+    path.write_bytes(MAGIC_V1 + struct.pack(">BdH", KIND_ADVERT, 1.0, len(body)) + body)
+
+    (record,) = iter_records(path.read_bytes())
+    assert record.advert.address == ADDRESS
+    assert record.advert.source == "local"
+
+    log = CaptureLog(path)
+    log.record_frame(FRAME, 2.0)
+    log.flush()
+    (frame,) = iter_records(path.read_bytes())
+    assert frame.body == FRAME
+    (old,) = iter_records((tmp_path / "capture.v1.bin").read_bytes())
+    assert old.advert.address == ADDRESS
@@ -0,0 +1,37 @@
+"""Tests for the Vson Bluetooth options flow."""
+
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.vson.const import (
+    CONF_MAX_POLL_INTERVAL,
+    CONF_MIN_POLL_INTERVAL,
+    DOMAIN,
+)
+
+from .conftest import ADDRESS
+
+
+async def test_min_interval_above_max_is_rejected(hass: HomeAssistant) -> None:
+    """A shortest poll interval longer than the longest one is an error."""
+    entry = MockConfigEntry(domain=DOMAIN, unique_id=ADDRESS)
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {CONF_MIN_POLL_INTERVAL: 30, CONF_MAX_POLL_INTERVAL: 10},
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": "min_above_max"}
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {CONF_MIN_POLL_INTERVAL: 10, CONF_MAX_POLL_INTERVAL: 30},
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert entry.options[CONF_MIN_POLL_INTERVAL] == 10
+    assert entry.options[CONF_MAX_POLL_INTERVAL] == 30
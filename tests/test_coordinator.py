@@ -0,0 +1,122 @@
+"""Tests for how polls reach the entity processors."""
+
+from __future__ import annotations
+
+from collections import Counter
+from contextlib import AbstractContextManager
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.components.bluetooth import async_get_advertisement_callback
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.vson.const import DOMAIN
+from custom_components.vson.device import VsonDataUpdateConverter
+
+from .conftest import ADDRESS, FRAME, advertisement
+
+# The first poll of any address is staggered across the initial 5 minute
+# interval
+FIRST_POLL = timedelta(seconds=302)
+
+
+async def _setup(hass: HomeAssistant) -> MockConfigEntry:
+    entry = MockConfigEntry(domain=DOMAIN, unique_id=ADDRESS)
+    entry.add_to_hass(hass)
+    async_get_advertisement_callback(hass)(advertisement())
+    await hass.async_block_till_done()
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+def _count_conversions() -> AbstractContextManager[Mock]:
+    """Wrap the conversion of every processor, recording the converter."""
+    return patch.object(
+        VsonDataUpdateConverter,
+        "__call__",
+        autospec=True,
+        side_effect=VsonDataUpdateConverter.__call__,
+    )
+
+
+def _per_processor(convert: Mock) -> Counter[int]:
+    return Counter(id(call.args[0]) for call in convert.call_args_list)
+
+
+async def test_scheduled_poll_converts_once(
+    hass: HomeAssistant, enable_bluetooth: None, freezer: FrozenDateTimeFactory
+) -> None:
+    """A poll started by the scheduler is converted once per processor."""
+    with (
+        patch(
+            "custom_components.vson.vson_ble.parser.get_sensor_data",
+            AsyncMock(return_value=FRAME),
+        ) as get_sensor_data,
+        _count_conversions() as convert,
+    ):
+        entry = await _setup(hass)
+        # Halfway, a changed advertisement keeps the device available
+        freezer.tick(FIRST_POLL / 2)
+        async_get_advertisement_callback(hass)(advertisement(name="WP6003 EEFF"))
+        await hass.async_block_till_done()
+        assert get_sensor_data.call_count == 0
+        convert.reset_mock()
+
+        # The device keeps advertising, but repeats are not dispatched
+        with patch(
+            "custom_components.vson.coordinator.async_last_service_info",
+            return_value=advertisement(name="WP6003 EEFF"),
+        ):
+            freezer.tick(FIRST_POLL / 2)
+            async_fire_time_changed(hass)
+            await hass.async_block_till_done(wait_background_tasks=True)
+
+        assert get_sensor_data.call_count == 1
+        assert set(_per_processor(convert).values()) == {1}
+        update = convert.call_args.args[1]
+        assert 593 in {value.native_value for value in update.entity_values.values()}
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+
+
+async def test_advertisement_poll_converts_once(
+    hass: HomeAssistant, enable_bluetooth: None, freezer: FrozenDateTimeFactory
+) -> None:
+    """An overdue poll started by an advertisement is converted once."""
+    with (
+        patch(
+            "custom_components.vson.vson_ble.parser.get_sensor_data",
+            AsyncMock(return_value=FRAME),
+        ) as get_sensor_data,
+        _count_conversions() as convert,
+    ):
+        entry = await _setup(hass)
+
+        # The first poll comes due while the device is not heard
+        with patch(
+            "custom_components.vson.coordinator.async_last_service_info",
+            return_value=None,
+        ):
+            freezer.tick(FIRST_POLL)
+            async_fire_time_changed(hass)
+            await hass.async_block_till_done(wait_background_tasks=True)
+        assert get_sensor_data.call_count == 0
+        convert.reset_mock()
+
+        # Only an advertisement whose content changed is dispatched; it is
+        # converted once itself, and the poll it starts once more
+        async_get_advertisement_callback(hass)(advertisement(name="WP6003 EEFF"))
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        assert get_sensor_data.call_count == 1
+        assert set(_per_processor(convert).values()) == {2}
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
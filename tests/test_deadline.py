@@ -0,0 +1,54 @@
+"""Tests for the per-poll deadline."""
+
+from __future__ import annotations
+
+import asyncio
+
+from bleak import BleakError
+import pytest
+
+from custom_components.vson.vson_ble.deadline import Deadline, DeadlineExceeded
+
+SHARES = {"connect": 0.5, "read": 0.25}
+
+
+async def test_phase_budget_is_its_share() -> None:
+    deadline = Deadline(10, SHARES)
+    assert deadline.budget("connect") == pytest.approx(5, abs=0.1)
+    assert deadline.budget("read") == pytest.approx(2.5, abs=0.1)
+    # A phase without a share may use whatever is left
+    assert deadline.budget("other") == pytest.approx(10, abs=0.1)
+
+
+async def test_phase_over_budget_raises() -> None:
+    """A phase that runs out is cancelled and raises DeadlineExceeded."""
+    deadline = Deadline(0.2, SHARES)
+    with pytest.raises(DeadlineExceeded, match="read took longer") as err:
+        async with deadline.phase("read"):
+            await asyncio.sleep(1)
+    # Callers handle it like any other Bluetooth error or timeout
+    assert isinstance(err.value, BleakError)
+    assert isinstance(err.value, TimeoutError)
+
+
+async def test_repeated_phase_gets_only_what_is_left() -> None:
+    """Connecting again after a drop cannot run past the total."""
+    deadline = Deadline(0.4, {"connect": 0.6})
+    async with deadline.phase("connect"):
+        await asyncio.sleep(0.2)
+    assert deadline.budget("connect") == pytest.approx(0.2, abs=0.05)
+    with pytest.raises(DeadlineExceeded):
+        async with deadline.phase("connect"):
+            await asyncio.sleep(1)
+    assert deadline.remaining() == 0
+    assert deadline.budget("connect") == 0
+
+
+async def test_other_timeouts_pass_through() -> None:
+    """A timeout raised inside the phase is not reported as the deadline's."""
+    deadline = Deadline(10, SHARES)
+    with pytest.raises(TimeoutError) as err:
+        async with deadline.phase("read"):
+            async with asyncio.timeout(0.01):
+                await asyncio.sleep(1)
+    assert not isinstance(err.value, DeadlineExceeded)
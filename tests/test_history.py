@@ -0,0 +1,72 @@
+"""Tests for the get_history action."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+import voluptuous as vol
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.vson.const import DOMAIN
+
+from .conftest import ADDRESS, FRAME
+
+
+async def _setup(hass: HomeAssistant) -> tuple[MockConfigEntry, str]:
+    entry = MockConfigEntry(domain=DOMAIN, unique_id=ADDRESS)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    device = dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id,
+        connections={(dr.CONNECTION_BLUETOOTH, ADDRESS)},
+    )
+    return entry, device.id
+
+
+async def test_zero_interval_is_rejected(
+    hass: HomeAssistant, enable_bluetooth: None
+) -> None:
+    """An interval of zero fails validation instead of dividing by it."""
+    entry, device_id = await _setup(hass)
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call(
+            DOMAIN,
+            "get_history",
+            {"device_id": device_id, "interval": "00:00:00"},
+            blocking=True,
+            return_response=True,
+        )
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_naive_times_use_configured_time_zone(
+    hass: HomeAssistant, enable_bluetooth: None
+) -> None:
+    """A start without an offset is in Home Assistant's time zone."""
+    await hass.config.async_set_time_zone("Asia/Seoul")
+    entry, device_id = await _setup(hass)
+    data = entry.runtime_data.device_data
+    # 09:00 and 11:00 in Seoul
+    for hour in (0, 2):
+        data.update_from_frame(
+            FRAME, datetime(2026, 1, 1, hour, tzinfo=dt_util.UTC).timestamp()
+        )
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "get_history",
+        {"device_id": device_id, "start": "2026-01-01 10:00:00"},
+        blocking=True,
+        return_response=True,
+    )
+    assert [reading["time"] for reading in response["readings"]] == [
+        "2026-01-01T02:00:00+00:00"
+    ]
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,126 @@
+"""Tests for the compressed reading history."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from custom_components.vson.vson_ble.history import (
+    BLOCK_SPAN,
+    HistoryStore,
+)
+
+START = 1_767_225_600  # 2026-01-01 00:00 UTC
+
+
+def _samples(count: int, seed: int = 1) -> list[tuple[int, tuple[int, ...]]]:
+    """Return readings with irregular gaps and mostly slow moving words."""
+    rng = random.Random(seed)
+    samples = []
+    timestamp = START
+    words = [265, 100, 10, 593]
+    for _ in range(count):
+        timestamp += rng.choice((60, 60, 60, 61, 59, 300, 1, 4000, 100_000))
+        for index in range(len(words)):
+            if rng.random() < 0.3:
+                words[index] = rng.randrange(0x10000)
+        samples.append((timestamp, tuple(words)))
+    return samples
+
+
+def test_round_trip_is_exact() -> None:
+    """Every timestamp and word reads back as appended, also after saving."""
+    samples = _samples(2000)
+    store = HistoryStore(retention=float("inf"))
+    for timestamp, words in samples:
+        assert store.append(timestamp, words)
+
+    assert list(store.query()) == samples
+    loaded = HistoryStore.from_bytes(store.to_bytes(), retention=float("inf"))
+    assert list(loaded.query()) == samples
+    assert len(loaded) == len(samples)
+
+
+def test_unchanged_readings_on_schedule_compress() -> None:
+    """A repeated reading a regular interval apart costs a few bits."""
+    store = HistoryStore()
+    for index in range(300):
+        store.append(START + index * 60, (265, 100, 10, 593))
+    assert len(store.blocks) == 1
+    # The first sample and the first delta, then 5 bits per sample
+    assert store.size <= 8 + 3 + 299 * 5 // 8 + 1
+
+
+def test_older_and_repeated_samples_are_ignored() -> None:
+    store = HistoryStore()
+    assert store.append(START, (1, 2, 3, 4))
+    assert not store.append(START, (5, 6, 7, 8))
+    assert not store.append(START - 60, (5, 6, 7, 8))
+    assert list(store.query()) == [(START, (1, 2, 3, 4))]
+
+
+def test_blocks_roll_over() -> None:
+    """A block is sealed once it spans BLOCK_SPAN, and a new one started."""
+    store = HistoryStore()
+    for index in range(BLOCK_SPAN // 600 * 3):
+        store.append(START + index * 600, (index, 0, 0, 0))
+
+    assert len(store.blocks) == 3
+    assert all(block.sealed for block in list(store.blocks)[:-1])
+    assert not store.blocks[-1].sealed
+    for block in store.blocks:
+        assert block.end - block.start < BLOCK_SPAN
+    # Loaded blocks are sealed, so the next sample starts a new block
+    loaded = HistoryStore.from_bytes(store.to_bytes())
+    loaded.append(store.blocks[-1].end + 60, (0, 0, 0, 0))
+    assert len(loaded.blocks) == 4
+
+
+def test_retention_drops_whole_blocks() -> None:
+    """Blocks that ended before the retention period are dropped."""
+    retention = 2 * BLOCK_SPAN
+    store = HistoryStore(retention=retention)
+    end = START + 10 * BLOCK_SPAN
+    for timestamp in range(START, end + 1, 600):
+        store.append(timestamp, (0, 0, 0, 0))
+
+    assert store.blocks[0].end >= end - retention
+    assert next(store.query())[0] < end - retention + BLOCK_SPAN
+    # The block holding the newest samples is never dropped
+    store.prune(end + 100 * BLOCK_SPAN)
+    assert len(store.blocks) == 1
+
+
+def test_query_range_and_downsample() -> None:
+    store = HistoryStore()
+    for index in range(6):
+        store.append(START + index * 60, (250 + index * 10, 0, 0, 500))
+
+    assert [timestamp for timestamp, _ in store.query(START + 60, START + 180)] == [
+        START + 60,
+        START + 120,
+        START + 180,
+    ]
+    readings = list(store.readings(end=START))
+    assert readings == [(START, (25.0, 0.0, 0.0, 500))]
+    assert list(store.downsample(180)) == [
+        (START, (26.0, 0.0, 0.0, 500.0)),
+        (START + 180, (29.0, 0.0, 0.0, 500.0)),
+    ]
+
+
+@pytest.mark.parametrize(
+    "data", [b"", b"VSH", b"XXXX\x00\x00\x00\x00", b"VSH1\x00\x00\x00\x01\x00"]
+)
+def test_damaged_file_is_rejected(data: bytes) -> None:
+    with pytest.raises(ValueError):
+        HistoryStore.from_bytes(data)
+
+
+def test_truncated_block_is_rejected() -> None:
+    store = HistoryStore()
+    for timestamp, words in _samples(50):
+        store.append(timestamp, words)
+    with pytest.raises(ValueError):
+        HistoryStore.from_bytes(store.to_bytes()[:-3])
@@ -0,0 +1,15 @@
+"""Keep the cold import of the integration within its budget."""
+
+from __future__ import annotations
+
+import statistics
+
+from benchmarks.import_budget import DEFAULT_MAX_MODULES, DEFAULT_MAX_MS, measure
+
+
+def test_import_budget() -> None:
+    """Importing the integration adds no more modules or time than budgeted."""
+    runs = [measure() for _ in range(3)]
+    modules = runs[-1][1]
+    assert len(modules) <= DEFAULT_MAX_MODULES, "\n".join(modules)
+    assert statistics.median(ms for ms, _ in runs) <= DEFAULT_MAX_MS
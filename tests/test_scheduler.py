@@ -0,0 +1,124 @@
+"""Tests for the poll scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import time
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.vson.scheduler import VsonPollScheduler
+
+from .conftest import ADDRESS
+
+
+async def test_poll_follows_previous_by_interval(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Every poll follows the previous one by the interval set during it."""
+    scheduler = VsonPollScheduler(hass)
+    intervals = iter([60, 90, 135, 202])
+    polls: list[float] = []
+
+    async def _poll() -> None:
+        async with scheduler.async_poll(ADDRESS, "local"):
+            polls.append(time.monotonic())
+            scheduler.async_set_interval(
+                ADDRESS, timedelta(seconds=next(intervals, 300))
+            )
+
+    remove = scheduler.async_add_device(ADDRESS, timedelta(seconds=300), _poll)
+    for _ in range(900):
+        freezer.tick(timedelta(seconds=1))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+    remove()
+
+    gaps = [round(later - earlier) for earlier, later in zip(polls, polls[1:])]
+    assert gaps == [60, 90, 135, 202]
+
+
+async def test_kept_connections_hold_their_slot(hass: HomeAssistant) -> None:
+    """An open connection takes a slot, and one slot stays free for the rest."""
+    scheduler = VsonPollScheduler(hass, max_connections=2)
+    connected = {"A": True, "B": True}
+
+    async def _poll(address: str) -> bool:
+        async with scheduler.async_poll(
+            address, "local", lambda: connected[address]
+        ) as keep:
+            if not keep:
+                connected[address] = False
+            return keep
+
+    assert await _poll("A")
+    assert not await _poll("B")
+    assert scheduler.stats()["kept_connections"] == 1
+
+    # The slot left free is not blocked by the kept connection
+    async with scheduler.async_slot("local"):
+        assert await _poll("A")
+
+    # A dropped connection gives its slot back after the next poll
+    connected["A"] = False
+    await _poll("A")
+    assert scheduler.stats()["kept_connections"] == 0
+    async with asyncio.timeout(1):
+        async with scheduler.async_slot("local"), scheduler.async_slot("local"):
+            pass
+
+
+async def test_first_polls_spread_across_interval(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Devices set up together first poll across the whole interval."""
+    scheduler = VsonPollScheduler(hass)
+    start = time.monotonic()
+    polls: list[float] = []
+    removers = []
+
+    for index in range(50):
+        address = f"AA:BB:CC:DD:{index // 256:02X}:{index % 256:02X}"
+
+        async def _poll(address: str = address) -> None:
+            async with scheduler.async_poll(address, "local"):
+                polls.append(time.monotonic() - start)
+
+        removers.append(
+            scheduler.async_add_device(address, timedelta(seconds=300), _poll)
+        )
+    for _ in range(300):
+        freezer.tick(timedelta(seconds=1))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+    for remove in removers:
+        remove()
+
+    assert len(polls) == 50
+    # Every tenth of the interval gets some of the first polls
+    assert {int(offset // 30) for offset in polls} == set(range(10))
+
+
+async def test_skipped_poll_is_retried(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """A poll skipped because the device was not around is tried again."""
+    scheduler = VsonPollScheduler(hass)
+    checks: list[float] = []
+
+    async def _absent() -> None:
+        checks.append(time.monotonic())
+
+    remove = scheduler.async_add_device(ADDRESS, timedelta(seconds=60), _absent)
+    for _ in range(300):
+        freezer.tick(timedelta(seconds=1))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+    remove()
+
+    gaps = [round(later - earlier) for earlier, later in zip(checks, checks[1:])]
+    assert len(checks) >= 4
+    assert set(gaps) == {60}
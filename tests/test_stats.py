@@ -0,0 +1,104 @@
+"""Tests for the rolling-window statistics."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from custom_components.vson.vson_ble.stats import ReadingStatistics, RollingWindow
+
+
+def _reference(
+    samples: list[tuple[float, float]], window: float
+) -> dict[str, float | None]:
+    """Compute the statistics of the window from scratch."""
+    last_time, last_value = samples[-1]
+    start = last_time - window
+    inside = [(time, value) for time, value in samples if time >= start]
+    before = [value for time, value in samples if time < start]
+    values = [value for _, value in inside]
+    # Hold each value until the next sample; the last one that left the
+    # window is held from the start of the window
+    points = inside if not before else [(start, before[-1]), *inside]
+    area = sum(
+        value * (next_time - time)
+        for (time, value), (next_time, _) in zip(points, points[1:])
+    )
+    duration = last_time - points[0][0]
+    return {
+        "mean": sum(values) / len(values),
+        "min": min(values),
+        "max": max(values),
+        "average": area / duration if duration > 0 else last_value,
+    }
+
+
+def test_empty_window() -> None:
+    window = RollingWindow(3600)
+    assert len(window) == 0
+    assert window.as_dict() == {
+        "mean": None,
+        "min": None,
+        "max": None,
+        "average": None,
+    }
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_recomputing_from_scratch(seed: int) -> None:
+    """Every statistic equals the one recomputed over the window."""
+    rng = random.Random(seed)
+    window = RollingWindow(3600)
+    samples: list[tuple[float, float]] = []
+    timestamp = 0.0
+    for _ in range(500):
+        # Adaptive polls: a minute to a couple of hours apart
+        timestamp += rng.choice((60, 60, 120, 300, 900, 5400))
+        value = float(rng.randrange(400, 2000))
+        samples.append((timestamp, value))
+        window.add(value, timestamp)
+
+        expected = _reference(samples, 3600)
+        actual = window.as_dict()
+        for key, value in expected.items():
+            assert actual[key] == pytest.approx(value), key
+
+
+def test_time_weighted_average_holds_values() -> None:
+    """A value counts for as long as it held, not once per sample."""
+    window = RollingWindow(3600)
+    window.add(400, 0)
+    window.add(1000, 3000)
+    window.add(1000, 3600)
+    # 400 for 3000 s, 1000 for 600 s
+    assert window.average == pytest.approx((400 * 3000 + 1000 * 600) / 3600)
+    assert window.mean == pytest.approx(800)
+
+
+def test_eviction_keeps_newest_sample() -> None:
+    """Samples older than the window leave it, the newest always stays."""
+    window = RollingWindow(600)
+    for timestamp, value in ((0, 5), (100, 1), (200, 9)):
+        window.add(value, timestamp)
+    window.add(3, 10_000)
+    assert len(window) == 1
+    assert (window.minimum, window.maximum, window.mean) == (3, 3, 3)
+    # The evicted 9 held until the newest sample arrived
+    assert window.average == pytest.approx(9)
+
+
+def test_samples_going_back_are_ignored() -> None:
+    window = RollingWindow(600)
+    window.add(5, 100)
+    window.add(1, 50)
+    assert len(window) == 1
+    assert window.minimum == 5
+
+
+def test_reading_statistics_skip_disabled_fields() -> None:
+    statistics = ReadingStatistics({"co2": 3600, "tvoc": 0})
+    statistics.add({"co2": 600, "tvoc": 0.1, "hcho": 0.01}, 0)
+    statistics.add({"co2": None}, 60)
+    assert set(statistics.windows) == {"co2"}
+    assert len(statistics.windows["co2"]) == 1
@@ -0,0 +1,44 @@
+"""Tests for the WP6003 client."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.vson.vson_ble import writer
+from custom_components.vson.vson_ble.simulator import Faults, SimulatedWp6003
+from custom_components.vson.vson_ble.writer import VsonClient
+
+
+async def test_cancelled_stream_leaves_no_task() -> None:
+    """Cancelling a consumer waiting for a frame cancels the wait too."""
+    device = SimulatedWp6003(seed=1)
+    vson = VsonClient(await device.connect(device.ble_device))
+
+    async def _consume() -> None:
+        async for _frame in vson.stream(interval=10):
+            pass
+
+    consumer = asyncio.create_task(_consume())
+    await asyncio.sleep(0.1)
+    consumer.cancel()
+    await asyncio.gather(consumer, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+async def test_hanging_disconnect_is_given_up(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A disconnect that never finishes does not hold up the poll."""
+    monkeypatch.setattr(writer, "DISCONNECT_TIMEOUT", 0.05)
+    device = SimulatedWp6003(seed=1, faults=Faults(disconnect_latency=3600))
+
+    async with asyncio.timeout(1):
+        frame = await writer.get_sensor_data(device.ble_device, connect=device.connect)
+
+    assert frame
+    for task in asyncio.all_tasks() - {asyncio.current_task()}:
+        task.cancel()